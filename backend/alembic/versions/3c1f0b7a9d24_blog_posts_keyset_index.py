@@ -0,0 +1,28 @@
+"""blog posts keyset index
+
+Revision ID: 3c1f0b7a9d24
+Revises: 9da4cd184e94
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0b7a9d24'
+down_revision: Union[str, Sequence[str], None] = '9da4cd184e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_blog_posts_created_at_id', 'blog_posts', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blog_posts_created_at_id', table_name='blog_posts')
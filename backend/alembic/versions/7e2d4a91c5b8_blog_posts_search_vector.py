@@ -0,0 +1,58 @@
+"""blog posts search vector
+
+Revision ID: 7e2d4a91c5b8
+Revises: 3c1f0b7a9d24
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2d4a91c5b8'
+down_revision: Union[str, Sequence[str], None] = '3c1f0b7a9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', immutable_array_to_string(paragraphs, ' ')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text)
+        RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT array_to_string($1, $2) $$
+        """
+    )
+    op.add_column(
+        'blog_posts',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_blog_posts_search_vector',
+        'blog_posts',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blog_posts_search_vector', table_name='blog_posts', postgresql_using='gin')
+    op.drop_column('blog_posts', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_array_to_string(text[], text)")
@@ -0,0 +1,99 @@
+"""blog posts search text
+
+Revision ID: b5f83c2e6a17
+Revises: 7e2d4a91c5b8
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from transliterate import translit
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f83c2e6a17'
+down_revision: Union[str, Sequence[str], None] = '7e2d4a91c5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+LATIN_RE = re.compile(r"[A-Za-z]")
+CYRILLIC_RE = re.compile(r"[А-Яа-я]")
+
+
+# Frozen copy of app.services.search.search_keys() as of this revision, so
+# later changes to the app cannot alter what this migration writes
+def _translit(value: str, **kwargs) -> str | None:
+    try:
+        return translit(value, **kwargs)
+    except Exception:
+        return None
+
+
+def search_keys(title: str | None) -> str:
+    if not title:
+        return ""
+    title = title.lower()
+    keys = [title]
+    forms = (
+        _translit(title, reversed=True) if CYRILLIC_RE.search(title) else None,
+        _translit(title, language_code="bg") if LATIN_RE.search(title) else None,
+    )
+    for form in forms:
+        if form and form not in keys:
+            keys.append(form)
+    return " ".join(keys)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'blog_posts',
+        sa.Column('search_text', sa.Text(), server_default='', nullable=False),
+    )
+
+    # Backfill existing posts the way handle_blog_post_upload now stores them
+    bind = op.get_bind()
+    blog_posts = sa.table(
+        'blog_posts', sa.column('id', sa.Integer), sa.column('title', sa.String)
+    )
+    update = sa.text("UPDATE blog_posts SET search_text = :search_text WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(blog_posts.c.id, blog_posts.c.title)
+            .where(blog_posts.c.id > last_id)
+            .order_by(blog_posts.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            update, [{"id": row.id, "search_text": search_keys(row.title)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_blog_posts_search_text_trgm',
+        'blog_posts',
+        ['search_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_blog_posts_search_text_trgm',
+        table_name='blog_posts',
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+    op.drop_column('blog_posts', 'search_text')
@@ -0,0 +1,33 @@
+"""blog posts excerpt
+
+Revision ID: d91a6e0f3b52
+Revises: b5f83c2e6a17
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91a6e0f3b52'
+down_revision: Union[str, Sequence[str], None] = 'b5f83c2e6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'blog_posts',
+        sa.Column('excerpt', sa.String(length=160), server_default='', nullable=False),
+    )
+    # Same as make_excerpt(): the first 160 characters of the first paragraph
+    op.execute("UPDATE blog_posts SET excerpt = coalesce(left(paragraphs[1], 160), '')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blog_posts', 'excerpt')
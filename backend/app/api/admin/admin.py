@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.settings import settings
 
 from app.services.auth import authenticate_user, create_session
-from app.db.session import get_read_session
+from app.db.session import get_read_session, get_write_session
 
 router = APIRouter()
 
@@ -28,15 +28,16 @@ async def admin_login(
     email: str = Form(...),
     password: str = Form(...),
     db_read: AsyncSession = Depends(get_read_session),
+    db_write: AsyncSession = Depends(get_write_session),
 ):
-    user = await authenticate_user(email, password, db_read)
+    user = await authenticate_user(email, password, db_read, db_write)
     if not user or user.role != "admin":
         return templates.TemplateResponse(
             "admin/login.html",
             {"request": request, "error": "Invalid admin username or password"},
         )
 
-    session_id = await create_session(user)
+    session_id = await create_session(user, request.headers.get("user-agent"))
 
     response = RedirectResponse(url="/admin/dashboard", status_code=302)
     response.set_cookie(
@@ -4,10 +4,14 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db.session import get_write_session, get_read_session
-from app.db.models.blog import BlogPost
+from app.db.models.blog import BlogPost, make_excerpt
 from app.services.s3.presentation_image import PresentationImageService
 from app.core.permissions import is_admin_authenticated
 from app.services.helpers import slugify
+from app.services.search import search_keys
+from app.services.suggest import rebuild_suggest_index
+from app.api.home import flush_home_cache
+from app.services.result_cache import blog_list_cache
 from datetime import datetime
 
 
@@ -42,8 +46,10 @@ async def handle_blog_post_upload(
             raise HTTPException(404, "Blog post not found")
         instance.title = title
         instance.paragraphs = paragraphs
+        instance.excerpt = make_excerpt(paragraphs)
         instance.updated_at = now
         instance.slug = slugify(title)
+        instance.search_text = search_keys(title)
         if authored_by:
             instance.authored_by = authored_by
     else:
@@ -51,7 +57,9 @@ async def handle_blog_post_upload(
         instance = BlogPost(
             title=title,
             paragraphs=paragraphs,
+            excerpt=make_excerpt(paragraphs),
             slug=slugify(title),
+            search_text=search_keys(title),
             authored_by=authored_by,
             created_at=now,
             updated_at=None
@@ -98,6 +106,9 @@ async def create_blog_post(
     await handle_blog_post_upload(
         db, title, paragraphs_list, authored_by=authored_by, image_file=image
     )
+    await flush_home_cache()
+    await blog_list_cache.invalidate()
+    await rebuild_suggest_index(db)
     return RedirectResponse(url="/admin/blogs/", status_code=303)
 
 
@@ -131,6 +142,9 @@ async def update_blog_post(
     await handle_blog_post_upload(
         db, title, paragraphs_list, authored_by=authored_by, image_file=image, instance_id=post_id
     )
+    await flush_home_cache()
+    await blog_list_cache.invalidate()
+    await rebuild_suggest_index(db)
     return RedirectResponse(url="/admin/blogs/", status_code=303)
 
 
@@ -150,4 +164,7 @@ async def delete_blog_post(post_id: int, db: AsyncSession = Depends(get_write_se
 
     await db.delete(post)
     await db.commit()
+    await flush_home_cache()
+    await blog_list_cache.invalidate()
+    await rebuild_suggest_index(db)
     return RedirectResponse(url="/admin/blogs/", status_code=303)
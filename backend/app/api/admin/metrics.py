@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from app.core.permissions import is_admin_authenticated
+from app.core.redis_client import redis_manager
+from app.db.routing import replica_lag
+from app.db.engines import pool_metrics
+from app.db.pool_stats import endpoint_pool_stats
+from app.db.session import engine_reader, engine_writer
+from app.services.hashing import password_hasher
+from app.services.result_cache import blog_list_cache
+from app.services.session_cache import session_cache
+from app.services.session_store import session_store
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def admin_metrics(admin=Depends(is_admin_authenticated)):
+    return {
+        "password_hashing": password_hasher.metrics(),
+        "session_cache": session_cache.metrics(),
+        "redis_pools": redis_manager.metrics(),
+        "session_store": session_store.metrics(),
+        "db_pools": {
+            "writer": pool_metrics(engine_writer),
+            "reader": pool_metrics(engine_reader),
+        },
+        "db_replica": replica_lag.metrics(),
+        "db_pool_usage": endpoint_pool_stats.metrics(),
+        "blog_list_cache": blog_list_cache.metrics(),
+    }
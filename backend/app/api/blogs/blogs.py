@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import Optional, List
+from typing import Optional, List, Literal
 
 from app.core.permissions import is_authenticated
 from app.db.session import get_read_session
-from app.db.models.blog import BlogPost
-from app.schemas.blog import BlogPostOut, BlogPostsWithAuthors
+from app.db.models.blog import BlogPost, summary_columns
+from app.schemas.blog import (
+    BlogPostOut,
+    BlogPostsWithAuthors,
+    BlogPostSuggestion,
+    BlogPostSummary,
+)
 from app.services.pagination import paginate
-from app.services.search import apply_filters_search_ordering
+from app.services.result_cache import blog_list_cache
+from app.services.search import (
+    apply_filters_search_ordering,
+    normalize_search,
+    search_snippets,
+)
+from app.services.suggest import suggest
 
 router = APIRouter()
 
@@ -23,13 +35,40 @@ async def list_blog_posts_with_authors(
     search: Optional[str] = None,
     author: Optional[str] = None,
     ordering: str = "-created_at",
+    pagination: Literal["page", "cursor"] = "page",
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_read_session),
     current_user=Depends(is_authenticated)
 ):
     """
-    Get paginated blog posts with optional search (title),
+    Get paginated blog posts with optional search (title, in Latin or Cyrillic),
     filter by author, ordering, and return distinct authors in the same response.
+
+    pagination=cursor (or any cursor) switches from page numbers to the
+    next_cursor / prev_cursor of the previous response.
+
+    With SEARCH_ENGINE=fulltext the search also covers paragraphs,
+    ordering=rank sorts by relevance and items carry a highlighted snippet.
+
+    Responses are cached in Redis until the TTL runs out or a post changes.
     """
+    started = time.perf_counter()
+    # One value for the filter and the cache key, so "Bob " is cached as "Bob"
+    author = (author or "").strip() or None
+    cache_key, cached = await blog_list_cache.lookup(
+        {
+            "search": normalize_search(search),
+            "author": author,
+            "ordering": ordering,
+            "page": page,
+            "page_size": page_size,
+            "pagination": pagination,
+            "cursor": cursor,
+        }
+    )
+    if cached:
+        blog_list_cache.record_hit(time.perf_counter() - started)
+        return Response(content=cached, media_type="application/json")
 
     # Base filters
     filters = []
@@ -42,7 +81,7 @@ async def list_blog_posts_with_authors(
         db=db,
         search=search,
         search_columns=[
-            BlogPost.title,
+            BlogPost.search_text,
         ],
         filters=filters,
         ordering=ordering,
@@ -56,15 +95,53 @@ async def list_blog_posts_with_authors(
         page_size=page_size,
         extra_filters=filters,
         ordering=order_by,
-        schema=BlogPostOut,
+        options=[summary_columns()],
+        schema=BlogPostSummary,
+        keyset=pagination == "cursor",
+        cursor=cursor,
     )
 
+    # Highlight matches in the returned page only
+    snippets = await search_snippets(
+        BlogPost,
+        db,
+        search,
+        [item.id for item in paginated["items"]],
+        func.immutable_array_to_string(BlogPost.paragraphs, " "),
+    )
+    for item in paginated["items"]:
+        item.snippet = snippets.get(item.id)
+
     # Get distinct authors in one query
     result = await db.execute(select(func.distinct(BlogPost.authored_by)))
     authors = [a[0] for a in result.all() if a[0]]
 
     # Combine into single response
-    return BlogPostsWithAuthors(**paginated, authors=authors)
+    content = BlogPostsWithAuthors(**paginated, authors=authors).model_dump_json()
+
+    # --- Cache in Redis ---
+    if cache_key:
+        await blog_list_cache.store(cache_key, content)
+        blog_list_cache.record_miss(time.perf_counter() - started)
+
+    return Response(content=content, media_type="application/json")
+
+
+# ==========================================
+# Title Suggestions (search as you type)
+# ==========================================
+@router.get("/suggest", response_model=List[BlogPostSuggestion])
+async def suggest_blog_posts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_session),
+    current_user=Depends(is_authenticated)
+):
+    """
+    Posts with a title word starting with q, Latin or Cyrillic, from a Redis
+    prefix index; no database query while the index exists.
+    """
+    return await suggest(db, q, limit)
 
 
 # ==========================================
@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.redis_client import get_redis_client, redis_manager
 from app.db.session import get_read_session
-from app.db.models.blog import BlogPost
-from app.schemas.blog import BlogPostOut
+from app.db.models.blog import BlogPost, summary_columns
+from app.schemas.blog import BlogPostSummary
+
+REDIS_KEY = "home_page"
+CACHE_TTL_SECONDS = 60
 
 router = APIRouter()
 
+
+async def flush_home_cache():
+    redis = await get_redis_client()
+    await redis.delete(REDIS_KEY)
+    redis_manager.mark_written(REDIS_KEY)
+
+
 @router.get("/home")
 async def get_home(db: AsyncSession = Depends(get_read_session)):
     """
@@ -15,9 +28,16 @@ async def get_home(db: AsyncSession = Depends(get_read_session)):
     - Blog posts (2 latest)
     """
 
+    # --- Try cached page ---
+    redis_read = await redis_manager.get_read_client(REDIS_KEY)
+    cached_home = await redis_read.get(REDIS_KEY)
+    if cached_home:
+        return Response(content=cached_home, media_type="application/json")
+
     # Blog posts query
     stmt_blogs = (
         select(BlogPost)
+        .options(summary_columns())
         .order_by(BlogPost.created_at.desc())
         .limit(2)
     )
@@ -25,6 +45,14 @@ async def get_home(db: AsyncSession = Depends(get_read_session)):
     result_blogs = await db.execute(stmt_blogs)
     blogs = result_blogs.scalars().all()
 
-    return {
-        "blogposts": [BlogPostOut.from_orm(b) for b in blogs],
-    }
+    content = json.dumps(
+        jsonable_encoder({
+            "blogposts": [BlogPostSummary.from_orm(b) for b in blogs],
+        })
+    )
+
+    # --- Cache in Redis ---
+    redis = await get_redis_client()
+    await redis.set(REDIS_KEY, content, ex=CACHE_TTL_SECONDS)
+
+    return Response(content=content, media_type="application/json")
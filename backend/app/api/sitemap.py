@@ -9,7 +9,7 @@ from datetime import datetime
 from typing import List, Any
 from transliterate import translit
 
-from app.core.redis_client import get_redis_client
+from app.core.redis_client import get_redis_client, redis_manager
 from app.db.session import get_read_session
 from app.db.models.blog import BlogPost
 from pydantic import BaseModel
@@ -37,7 +37,8 @@ async def sitemap(
     redis: Any = Depends(get_redis_client),
 ):
     # --- Try cached sitemap ---
-    cached_sitemap = await redis.get(REDIS_KEY)
+    redis_read = await redis_manager.get_read_client(REDIS_KEY)
+    cached_sitemap = await redis_read.get(REDIS_KEY)
     if cached_sitemap:
         return Response(content=cached_sitemap, media_type="application/xml")
 
@@ -83,4 +84,5 @@ async def sitemap(
 @router.get("/sitemap/flush")
 async def flush_sitemap_cache(redis: Any = Depends(get_redis_client)):
     await redis.delete(REDIS_KEY)
+    redis_manager.mark_written(REDIS_KEY)
     return {"status": "ok", "message": "Sitemap cache cleared"}
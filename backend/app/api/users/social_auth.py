@@ -5,9 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func
 from app.db.models.user import User
-from app.db.session import get_write_session, get_read_session
+from app.db.routing import get_routing_session, pin_db_reads
 from app.services.stats import increment_daily_user_stat
-from app.services.auth import create_session, hash_password, delete_session
+from app.services.auth import create_session, hash_password
 import httpx
 from app.core.settings import settings
 from pydantic import BaseModel
@@ -35,8 +35,7 @@ class FacebookLoginPayload(BaseModel):
 async def google_login(
     payload: GoogleLoginPayload,
     request: Request,
-    db_read: AsyncSession = Depends(get_read_session),
-    db_write: AsyncSession = Depends(get_write_session),
+    db: AsyncSession = Depends(get_routing_session),
 ):
     # Extract dynamic redirect from state
     redirect_to = "/profile"
@@ -85,11 +84,11 @@ async def google_login(
     profile_picture = data.get("picture")
 
     # Check if user exists
-    result = await db_read.execute(select(User).filter_by(email=email))
+    result = await db.execute(select(User).filter_by(email=email))
     user = result.scalars().first()
 
     if not user:
-        hashed_password = hash_password(secrets.token_urlsafe(16))
+        hashed_password = await hash_password(secrets.token_urlsafe(16))
         user = User(
             email=email,
             hashed_password=hashed_password,
@@ -98,12 +97,19 @@ async def google_login(
             last_name=last_name,
             profile_picture=profile_picture,
         )
-        db_write.add(user)
-        await db_write.commit()
-        await db_write.refresh(user)
-
-    # Create session
-    session_id = await create_session(user)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+    # Create session, deleting any anonymous session in the same transaction
+    session_id = await create_session(
+        user,
+        request.headers.get("user-agent"),
+        replace_anonymous_session_id=anon_session_id,
+    )
+    if db.info.get("committed"):
+        # The new account must be visible on the first request with the new session
+        await pin_db_reads(session_id)
 
     return {
         "session_id": session_id,
@@ -119,8 +125,7 @@ async def google_login(
 async def facebook_login(
     payload: FacebookLoginPayload,
     request: Request,
-    db_read: AsyncSession = Depends(get_read_session),
-    db_write: AsyncSession = Depends(get_write_session),
+    db: AsyncSession = Depends(get_routing_session),
 ):
     # Extract dynamic redirect from state
     redirect_to = "/profile"
@@ -163,11 +168,11 @@ async def facebook_login(
     )
 
     # Check if user exists
-    result = await db_read.execute(select(User).filter_by(email=email))
+    result = await db.execute(select(User).filter_by(email=email))
     user = result.scalars().first()
 
     if not user:
-        hashed_password = hash_password(secrets.token_urlsafe(16))
+        hashed_password = await hash_password(secrets.token_urlsafe(16))
         user = User(
             email=email,
             hashed_password=hashed_password,
@@ -176,12 +181,19 @@ async def facebook_login(
             last_name=last_name,
             profile_picture=profile_picture,
         )
-        db_write.add(user)
-        await db_write.commit()
-        await db_write.refresh(user)
-
-    # Create session
-    session_id = await create_session(user)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+
+    # Create session, deleting any anonymous session in the same transaction
+    session_id = await create_session(
+        user,
+        request.headers.get("user-agent"),
+        replace_anonymous_session_id=anon_session_id,
+    )
+    if db.info.get("committed"):
+        # The new account must be visible on the first request with the new session
+        await pin_db_reads(session_id)
 
     return {
         "session_id": session_id,
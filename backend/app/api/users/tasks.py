@@ -1,12 +1,13 @@
-import redis
-from app.celery_app import celery_app
+import random
+from app.celery_app import celery_app, async_task
+from app.core.settings import settings
+from app.core.redis_client import get_redis_client, get_sync_redis_client
+from app.core.locks import AsyncRedisLock, RedisLock
 from datetime import datetime
 from app.db.celery_session import get_write_session
 from contextlib import asynccontextmanager
 from sqlalchemy import text
 
-redis_client = redis.Redis(host="redis", port=6379, db=0)
-
 
 @asynccontextmanager
 async def get_session():
@@ -25,16 +26,87 @@ async def dummy_db_task_async():
         print(f"Dummy task ran at {now.isoformat()}")
 
 
-@celery_app.task(name="app.tasks.dummy_db_task")
-def dummy_db_task():
-    lock_key = "lock:dummy_db_task"
-    have_lock = redis_client.set(lock_key, "locked", nx=True, ex=60)
-    if not have_lock:
+@async_task(name="app.tasks.dummy_db_task")
+async def dummy_db_task():
+    lock = AsyncRedisLock(await get_redis_client(), "dummy_db_task", ttl=60)
+    if not await lock.acquire():
         print("Lock exists, skipping the task.")
         return
 
     try:
-        loop = celery_app.asyncio_loop
-        loop.run_until_complete(dummy_db_task_async())
+        await dummy_db_task_async()
+    finally:
+        await lock.release()
+
+
+@celery_app.task(name="app.tasks.anonymous_session_gc")
+def anonymous_session_gc():
+    """
+    Report anonymous-session memory from a sampled SCAN and reclaim keys that
+    outlive ANONYMOUS_SESSION_EXPIRE_SECONDS (e.g. written with the old 7-day TTL).
+    """
+    redis_client = get_sync_redis_client()
+    lock = RedisLock(redis_client, "anonymous_session_gc", ttl=60)
+    if not lock.acquire():
+        print("Anonymous session GC already running, skipping.")
+        return
+    try:
+        return _anonymous_session_gc(redis_client)
     finally:
-        redis_client.delete(lock_key)
+        lock.release()
+
+
+def _anonymous_session_gc(redis_client) -> dict:
+    max_ttl = settings.ANONYMOUS_SESSION_EXPIRE_SECONDS
+    total_keys = 0
+    shortened = 0
+    sampled_keys = 0
+    sampled_bytes = 0
+
+    for keys in _scan_batches(redis_client, "anonymous_session:*"):
+        total_keys += len(keys)
+        sampled = [
+            key
+            for key in keys
+            if random.random() < settings.ANONYMOUS_SESSION_GC_SAMPLE_RATE
+        ]
+
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        for key in sampled:
+            pipe.memory_usage(key)
+        results = pipe.execute()
+        ttls, usages = results[: len(keys)], results[len(keys):]
+
+        sampled_keys += len(sampled)
+        sampled_bytes += sum(usage or 0 for usage in usages)
+
+        pipe = redis_client.pipeline(transaction=False)
+        for key, ttl in zip(keys, ttls):
+            # -1: no expiry at all, > max_ttl: written before the shorter TTL
+            if ttl == -1 or ttl > max_ttl:
+                pipe.expire(key, max_ttl)
+                shortened += 1
+        pipe.execute()
+
+    avg_bytes = sampled_bytes / sampled_keys if sampled_keys else 0
+    report = {
+        "keys": total_keys,
+        "sampled_keys": sampled_keys,
+        "avg_bytes": round(avg_bytes),
+        "estimated_bytes": round(avg_bytes * total_keys),
+        "ttl_shortened": shortened,
+    }
+    print(f"Anonymous session GC: {report}")
+    return report
+
+
+def _scan_batches(redis_client, match: str, count: int = 1000):
+    cursor = 0
+    while True:
+        cursor, keys = redis_client.scan(cursor=cursor, match=match, count=count)
+        if keys:
+            yield keys
+        if cursor == 0:
+            break
@@ -21,6 +21,7 @@ from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from app.core.permissions import require_role
 from app.core.settings import settings
 from app.db.session import get_read_session, get_write_session
+from app.db.routing import get_routing_session
 from app.db.models.user import User, PasswordResetToken, DailyUserStats
 from app.schemas.user import (
     UserRead,
@@ -36,9 +37,12 @@ from app.services.s3.profile_picture import ProfilePictureService
 from app.services.auth import (
     authenticate_user,
     create_session,
-    update_session_data,
+    update_user_sessions,
     delete_session,
+    revoke_user_sessions,
+    list_user_sessions,
     extend_session_expiry,
+    reissue_session_token,
     create_anonymous_session,
     create_user,
     hash_password,
@@ -67,14 +71,13 @@ async def register(
     user_create: UserCreate,
     request: Request,
     anonymous_session_id: str | None = Cookie(None),
-    db_read: AsyncSession = Depends(get_read_session),
-    db_write: AsyncSession = Depends(get_write_session),
+    db: AsyncSession = Depends(get_routing_session),
 ):
     if not await check_email_mx(user_create.email):
         raise HTTPException(status_code=400, detail="The email is invalid.")
 
     existing_user = (
-        (await db_read.execute(select(User).where(User.email == user_create.email)))
+        (await db.execute(select(User).where(User.email == user_create.email)))
         .scalars()
         .first()
     )
@@ -84,7 +87,7 @@ async def register(
             status_code=400, detail="An account with this email already exists."
         )
 
-    user = await create_user(user_create, db_write)
+    user = await create_user(user_create, db)
 
     # -------------------- Send Confirmation Email --------------------
     raw_token = serializer.dumps(user.email, salt="email-confirm-salt")
@@ -168,7 +171,9 @@ async def login(
     db_read: AsyncSession = Depends(get_read_session),
     db_write: AsyncSession = Depends(get_write_session),
 ):
-    user = await authenticate_user(form_data.email, form_data.password, db_read)
+    user = await authenticate_user(
+        form_data.email, form_data.password, db_read, db_write
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -188,12 +193,12 @@ async def login(
             detail="You do not have permission to log in.",
         )
 
-    # Delete any anonymous session on login
-    if anonymous_session_id:
-        await delete_session(anonymous_session_id, anonymous=True)
-
-    # Create user session
-    session_id = await create_session(user)
+    # Create user session, deleting any anonymous session in the same transaction
+    session_id = await create_session(
+        user,
+        request.headers.get("user-agent"),
+        replace_anonymous_session_id=anonymous_session_id,
+    )
     expires_at = datetime.utcnow() + timedelta(seconds=settings.SESSION_EXPIRE_SECONDS)
 
     # Use the existing unique_id cookie (or fallback to user id if missing)
@@ -214,10 +219,10 @@ async def login(
 @router.get("/me", response_model=UserRead)
 async def get_me(
     session_data: dict = Depends(require_role("customer")),
-    db_read: AsyncSession = Depends(get_read_session),
+    db: AsyncSession = Depends(get_routing_session),
 ):
     email = session_data.get("email")
-    result = await db_read.execute(select(User).filter(User.email == email))
+    result = await db.execute(select(User).filter(User.email == email))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=401, detail="You do not have permission")
@@ -232,7 +237,7 @@ async def update_profile(
     request: Request,
     profile_picture: UploadFile | None = File(None),
     session_data: dict = Depends(require_role("customer")),
-    db_write: AsyncSession = Depends(get_write_session),
+    db: AsyncSession = Depends(get_routing_session),
 ):
     email = session_data.get("email")
 
@@ -247,7 +252,7 @@ async def update_profile(
         if not profile_picture and "profile_picture" in form:
             profile_picture = form["profile_picture"]
 
-    result = await db_write.execute(select(User).filter(User.email == email))
+    result = await db.execute(select(User).filter(User.email == email))
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -267,10 +272,10 @@ async def update_profile(
         url = await profile_service.upload_profile_picture(profile_picture)
         user.profile_picture = url
 
-    db_write.add(user)
-    await db_write.commit()
-    await db_write.refresh(user)
-    await update_session_data(session_data["session_id"], user)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    await update_user_sessions(user)
 
     return UserUpdate(
         first_name=user.first_name,
@@ -285,33 +290,79 @@ async def update_profile(
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
     session_id: str | None = Cookie(None),
-    _=Depends(require_role("customer")),
+    session_data: dict = Depends(require_role("customer")),
 ):
     if not session_id:
         raise HTTPException(status_code=401, detail="No session found")
 
-    await delete_session(session_id)
+    await delete_session(session_id, user_id=session_data.get("user_id"))
+    return
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    keep_current: bool = False,
+    session_data: dict = Depends(require_role("customer")),
+):
+    await revoke_user_sessions(
+        session_data["user_id"],
+        keep_session_id=session_data["session_id"] if keep_current else None,
+    )
     return
 
 
+# ------------------------------
+# Active sessions (devices)
+# ------------------------------
+@router.get("/sessions")
+async def get_active_sessions(
+    session_data: dict = Depends(require_role("customer")),
+):
+    sessions = await list_user_sessions(
+        session_data["user_id"], current_session_id=session_data["session_id"]
+    )
+    return [
+        {
+            "user_agent": s["user_agent"],
+            "created_at": s["created_at"],
+            "expires_at": s["expires_at"],
+            "current": s["current"],
+        }
+        for s in sessions
+    ]
+
+
 # ------------------------------
 # Refresh session
 # ------------------------------
 @router.post("/refresh-session")
 async def refresh_session(
     session_id: str | None = Cookie(None),
-    _=Depends(require_role("customer")),
+    session_data: dict = Depends(require_role("customer")),
 ):
     if not session_id:
         raise HTTPException(status_code=401, detail="No session found")
 
-    updated = await extend_session_expiry(session_id)
+    updated = await extend_session_expiry(
+        session_id, user_id=session_data.get("user_id")
+    )
     if not updated:
         raise HTTPException(
             status_code=401, detail="Error updating the session"
         )
 
-    return {"message": "Session has been refreshed", "session_id": session_id}
+    session_id = await reissue_session_token(session_id)
+    if not session_id:
+        raise HTTPException(
+            status_code=401, detail="Error updating the session"
+        )
+    expires_at = datetime.utcnow() + timedelta(seconds=settings.SESSION_EXPIRE_SECONDS)
+
+    return {
+        "message": "Session has been refreshed",
+        "session_id": session_id,
+        "expires_at": expires_at.isoformat() + "Z",
+    }
 
 
 BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
@@ -327,6 +378,8 @@ async def password_reset_request(
 ):
     result = await db_read.execute(select(User).filter(User.email == request.email))
     user = result.scalars().first()
+    # Release the reader before the token write and the SMTP round trip
+    await db_read.commit()
     if not user:
         raise HTTPException(
             status_code=404, detail="An account with this email does not exist."
@@ -400,7 +453,7 @@ async def password_reset_confirm(
             detail="You do not have permission to perform this action.",
         )
 
-    user.hashed_password = hash_password(data.new_password)
+    user.hashed_password = await hash_password(data.new_password)
     reset_token.used = True
     await db_write.commit()
 
@@ -416,7 +469,9 @@ async def create_anon_session(
     session: AsyncSession = Depends(get_write_session),
 ):
     session_id = await create_anonymous_session()
-    expires_at = datetime.utcnow() + timedelta(seconds=settings.SESSION_EXPIRE_SECONDS)
+    expires_at = datetime.utcnow() + timedelta(
+        seconds=settings.ANONYMOUS_SESSION_EXPIRE_SECONDS
+    )
     unique_id = request.cookies.get("unique_id")
     if not unique_id:
         unique_id = str(uuid.uuid4())
@@ -1,28 +1,62 @@
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import worker_process_init
-import asyncio
+from celery.signals import (
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+import functools
+from app.core.settings import settings
+from app.core.async_runner import AsyncLoopRunner
+from app.db.celery_session import celery_db
 
 celery_app = Celery(
     "app",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
 )
 celery_app.conf.broker_connection_retry_on_startup = True
 
+# One event loop per worker process, shared by all async tasks. Run the
+# worker with -P threads so several async tasks are in flight at once.
+async_runner = AsyncLoopRunner(max_in_flight=settings.CELERY_ASYNC_MAX_IN_FLIGHT)
+
+
+def async_task(*args, **kwargs):
+    """celery_app.task for coroutine functions, run on the process event loop"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def run(*task_args, **task_kwargs):
+            return async_runner.run(func(*task_args, **task_kwargs))
+
+        return celery_app.task(*args, **kwargs)(run)
+
+    return decorator
+
+
 import app.api.users.tasks  # noqa
 
 celery_app.conf.beat_schedule = {
     "dummy-db-task-every-day": {
         "task": "app.tasks.dummy_db_task",
         "schedule": crontab(hour=3, minute=0),
-    }
+    },
+    "anonymous-session-gc-every-hour": {
+        "task": "app.tasks.anonymous_session_gc",
+        "schedule": crontab(minute=15),
+    },
 }
 
 celery_app.conf.timezone = "UTC"
 
 @worker_process_init.connect
 def init_asyncio_loop(**kwargs):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    celery_app.asyncio_loop = loop
+    celery_app.asyncio_loop = async_runner.start()
+    celery_db.init()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def dispose_db_engines(**kwargs):
+    async_runner.stop(cleanup=celery_db.dispose)
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+
+class AsyncLoopRunner:
+    """
+    Event loop running in a background thread of the current process.
+    Coroutines submitted from any thread run on it concurrently, at most
+    max_in_flight at a time; callers block until their own result is ready.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A loop inherited through fork has no thread in this process
+            if self._thread is None or not self._thread.is_alive():
+                self.loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                self._thread = threading.Thread(
+                    target=self.loop.run_forever, name="async-task-loop", daemon=True
+                )
+                self._thread.start()
+            return self.loop
+
+    async def _limited(self, coro):
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                return await coro
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def run(self, coro, timeout: float | None = None):
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro), self.loop)
+        return future.result(timeout)
+
+    def stop(self, cleanup=None):
+        """Await the optional cleanup coroutine function, then close the loop"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return
+            if cleanup is not None:
+                asyncio.run_coroutine_threadsafe(cleanup(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self._thread = None
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import uuid
+
+# Lock and fence keys share the {name} hash tag, so the scripts also work
+# on Redis Cluster.
+ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return redis.call('INCR', KEYS[2])
+end
+return false
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class _BaseLock:
+    """
+    Redis lease lock. acquire() returns a fencing token that increases with
+    every successful acquisition, so storage written under the lock can reject
+    a stale holder. Only the owner can release or renew the lease; while held
+    it is renewed every ttl / 3 seconds, and `lost` is set if that fails.
+    """
+
+    def __init__(self, redis_client, name: str, ttl: float = 60, renew: bool = True):
+        self.redis = redis_client
+        self.name = name
+        self.ttl = ttl
+        self.renew = renew
+        self.key = f"lock:{{{name}}}"
+        self.fence_key = f"lock:{{{name}}}:fence"
+        self.owner = uuid.uuid4().hex
+        self.token: int | None = None
+        self.lost = False
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._renew = redis_client.register_script(RENEW_SCRIPT)
+
+    @property
+    def _ttl_ms(self) -> int:
+        return int(self.ttl * 1000)
+
+    def _lost_lease(self):
+        self.lost = True
+        print(f"Lock {self.name} lost its lease (token {self.token})")
+
+
+class RedisLock(_BaseLock):
+    """Lease lock for sync code (Celery tasks); renews from a daemon thread"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stop = threading.Event()
+        self._renewer: threading.Thread | None = None
+
+    def acquire(self) -> int | None:
+        token = self._acquire(keys=[self.key, self.fence_key], args=[self.owner, self._ttl_ms])
+        if not token:
+            return None
+        self.token = int(token)
+        if self.renew:
+            self._stop.clear()
+            self._renewer = threading.Thread(
+                target=self._renew_loop, name=f"lock-renew-{self.name}", daemon=True
+            )
+            self._renewer.start()
+        return self.token
+
+    def _renew_loop(self):
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                renewed = self._renew(keys=[self.key], args=[self.owner, self._ttl_ms])
+            except Exception as e:
+                print(f"Lock {self.name} renewal failed: {e}")
+                continue
+            if not renewed:
+                self._lost_lease()
+                return
+
+    def release(self) -> bool:
+        self._stop.set()
+        if self._renewer is not None:
+            self._renewer.join()
+            self._renewer = None
+        return bool(self._release(keys=[self.key], args=[self.owner]))
+
+
+class AsyncRedisLock(_BaseLock):
+    """Lease lock for async code; renews from a task on the running loop"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._renewer: asyncio.Task | None = None
+
+    async def acquire(self) -> int | None:
+        token = await self._acquire(
+            keys=[self.key, self.fence_key], args=[self.owner, self._ttl_ms]
+        )
+        if not token:
+            return None
+        self.token = int(token)
+        if self.renew:
+            self._renewer = asyncio.create_task(self._renew_loop())
+        return self.token
+
+    async def _renew_loop(self):
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await self._renew(keys=[self.key], args=[self.owner, self._ttl_ms])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Lock {self.name} renewal failed: {e}")
+                continue
+            if not renewed:
+                self._lost_lease()
+                return
+
+    async def release(self) -> bool:
+        if self._renewer is not None:
+            self._renewer.cancel()
+            try:
+                await self._renewer
+            except asyncio.CancelledError:
+                pass
+            self._renewer = None
+        return bool(await self._release(keys=[self.key], args=[self.owner]))
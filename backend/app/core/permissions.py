@@ -6,7 +6,7 @@ async def is_authenticated(session_id: str | None = Cookie(None)):
     if not session_id:
         raise HTTPException(status_code=401, detail="Access denied")
 
-    session_data = await get_session(session_id)
+    session_data = await get_session(session_id, touch=True)
     if not session_data:
         raise HTTPException(status_code=401, detail="Access denied")
 
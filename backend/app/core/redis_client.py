@@ -1,13 +1,231 @@
+import asyncio
+import random
+import threading
+import time
 from app.core.settings import settings
-import redis.asyncio as redis
+import redis
+import redis.asyncio as aioredis
 
-redis_client: redis.Redis | None = None
 
+def _pool_kwargs() -> dict:
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_POOL_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "retry_on_timeout": True,
+    }
 
-async def get_redis_client() -> redis.Redis:
-    global redis_client
-    if not redis_client:
-        redis_client = await redis.from_url(
-            settings.REDIS_URL, encoding="utf-8", decode_responses=True
+
+def _cluster_kwargs() -> dict:
+    # RedisCluster keeps a non-blocking pool per node and takes no pool
+    # timeout or retry_on_timeout; it retries commands that hit a timeout or
+    # connection error itself, reinitializing the slot map between attempts.
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "cluster_error_retry_attempts": 3,
+    }
+
+
+def _pool_metrics(pool) -> dict:
+    created = len(pool._connections)
+    # Idle connections sit in the queue next to None placeholders for
+    # connections that have not been created yet. queue.LifoQueue keeps its
+    # items in .queue, asyncio.LifoQueue in ._queue.
+    queued = getattr(pool.pool, "queue", None) or getattr(pool.pool, "_queue", [])
+    idle = sum(1 for connection in queued if connection is not None)
+    return {
+        "max_connections": pool.max_connections,
+        "created": created,
+        "in_use": created - idle,
+        "idle": idle,
+    }
+
+
+def _blocking_client(url: str, decode_responses: bool = False) -> aioredis.Redis:
+    return aioredis.Redis(
+        connection_pool=aioredis.BlockingConnectionPool.from_url(
+            url, decode_responses=decode_responses, **_pool_kwargs()
+        )
+    )
+
+
+class RedisManager:
+    """
+    Owns the shared async Redis pools. Started from the FastAPI lifespan;
+    lazy initialization is kept for code running outside the app (scripts)
+    and is guarded by a lock so concurrent first calls share one pool.
+
+    With replica_urls, get_read_client spreads reads over the replicas except
+    for keys passed to mark_written in the last read_your_writes seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        replica_urls: list[str] | None = None,
+        read_your_writes: float = 0,
+    ):
+        self.url = url
+        self.replica_urls = replica_urls or []
+        self.read_your_writes = read_your_writes
+        self._lock = asyncio.Lock()
+        self.client: aioredis.Redis | None = None
+        self.binary_client: aioredis.Redis | None = None
+        self.replica_clients: list[aioredis.Redis] = []
+        self.replica_binary_clients: list[aioredis.Redis] = []
+        # key -> monotonic deadline until which reads stay on the primary
+        self._written: dict[str, float] = {}
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    async def startup(self):
+        async with self._lock:
+            if self.client is not None:
+                return
+            self.client = _blocking_client(self.url, decode_responses=True)
+            # Bytes-returning client for values that are not UTF-8 text
+            self.binary_client = _blocking_client(self.url)
+            self.replica_clients = [
+                _blocking_client(url, decode_responses=True) for url in self.replica_urls
+            ]
+            self.replica_binary_clients = [
+                _blocking_client(url) for url in self.replica_urls
+            ]
+
+    async def shutdown(self):
+        async with self._lock:
+            for client in (
+                self.client,
+                self.binary_client,
+                *self.replica_clients,
+                *self.replica_binary_clients,
+            ):
+                if client is not None:
+                    await client.close(close_connection_pool=True)
+            self.client = None
+            self.binary_client = None
+            self.replica_clients = []
+            self.replica_binary_clients = []
+
+    def pubsub_client(self) -> aioredis.Redis:
+        """
+        New single-connection client for a long-lived subscription, closed
+        by the caller. Reads wait for messages with no socket timeout and
+        liveness is checked with PINGs instead; errors are raised, never
+        retried, so the subscriber knows it has to resubscribe.
+        """
+        return aioredis.Redis.from_url(
+            self.url,
+            decode_responses=True,
+            max_connections=1,
+            socket_timeout=None,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+
+    async def get_client(self) -> aioredis.Redis:
+        if self.client is None:
+            await self.startup()
+        return self.client
+
+    async def get_binary_client(self) -> aioredis.Redis:
+        if self.binary_client is None:
+            await self.startup()
+        return self.binary_client
+
+    def mark_written(self, key: str):
+        """Keep reads of key on the primary until replicas have caught up"""
+        if not self.replica_urls:
+            return
+        now = time.monotonic()
+        if len(self._written) > 10000:
+            self._written = {
+                key: deadline for key, deadline in self._written.items() if deadline > now
+            }
+        self._written[key] = now + self.read_your_writes
+
+    def _reads_from_primary(self, key: str) -> bool:
+        if not self.replica_urls:
+            return True
+        deadline = self._written.get(key)
+        if deadline is None:
+            return False
+        if deadline < time.monotonic():
+            del self._written[key]
+            return False
+        return True
+
+    async def get_read_client(self, key: str, binary: bool = False) -> aioredis.Redis:
+        """Client to read key from: a random replica unless key was just written"""
+        if self._reads_from_primary(key):
+            self.primary_reads += 1
+            return await (self.get_binary_client() if binary else self.get_client())
+        if self.client is None:
+            await self.startup()
+        self.replica_reads += 1
+        return random.choice(
+            self.replica_binary_clients if binary else self.replica_clients
         )
-    return redis_client
+
+    def metrics(self) -> dict:
+        metrics = {}
+        for name, client in (("text", self.client), ("binary", self.binary_client)):
+            if client is not None:
+                metrics[name] = _pool_metrics(client.connection_pool)
+        for url, client in zip(self.replica_urls, self.replica_clients):
+            metrics[f"replica {url}"] = _pool_metrics(client.connection_pool)
+        for url, client in zip(self.replica_urls, self.replica_binary_clients):
+            metrics[f"replica binary {url}"] = _pool_metrics(client.connection_pool)
+        if self.replica_urls:
+            metrics["reads"] = {
+                "primary": self.primary_reads,
+                "replica": self.replica_reads,
+                "pinned_keys": len(self._written),
+            }
+        sync_client = _sync_client
+        if sync_client is not None:
+            metrics["sync"] = _pool_metrics(sync_client.connection_pool)
+        return metrics
+
+
+redis_manager = RedisManager(
+    settings.REDIS_URL,
+    replica_urls=settings.REDIS_REPLICA_URLS,
+    read_your_writes=settings.REDIS_READ_YOUR_WRITES_SECONDS,
+)
+
+
+async def get_redis_client() -> aioredis.Redis:
+    return await redis_manager.get_client()
+
+
+async def get_redis_binary_client() -> aioredis.Redis:
+    return await redis_manager.get_binary_client()
+
+
+# ------------------------------
+# Sync client (Celery)
+# ------------------------------
+_sync_client: redis.Redis | None = None
+_sync_lock = threading.Lock()
+
+
+def get_sync_redis_client() -> redis.Redis:
+    global _sync_client
+    if _sync_client is None:
+        with _sync_lock:
+            if _sync_client is None:
+                _sync_client = redis.Redis(
+                    connection_pool=redis.BlockingConnectionPool.from_url(
+                        settings.REDIS_URL, decode_responses=True, **_pool_kwargs()
+                    )
+                )
+    return _sync_client
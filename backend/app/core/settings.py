@@ -23,15 +23,139 @@ class Settings:
         "ANONYMOUS_SESSION_COOKIE_NAME", "anonymous_session_id"
     )
     RESET_TOKEN_EXPIRE_SECONDS: int = 900
+    # Anonymous sessions only reach Redis once data is written to them
+    ANONYMOUS_SESSION_EXPIRE_SECONDS: int = int(
+        os.getenv("ANONYMOUS_SESSION_EXPIRE_SECONDS", 86400)
+    )
+    ANONYMOUS_SESSION_GC_SAMPLE_RATE: float = float(
+        os.getenv("ANONYMOUS_SESSION_GC_SAMPLE_RATE", 0.01)
+    )
+    # "redis": opaque session id cookie, every check reads Redis.
+    # "signed": the cookie is a signed token with the user claims; Redis is only
+    # consulted once the token is older than SESSION_TOKEN_MAX_AGE or revoked.
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "redis")
+    SESSION_TOKEN_MAX_AGE: int = int(os.getenv("SESSION_TOKEN_MAX_AGE", 300))
+    # "json" or "msgpack"; both formats are always readable
+    SESSION_SERIALIZER: str = os.getenv("SESSION_SERIALIZER", "json")
+    # Sliding expiry: authenticated requests push the session TTL back to
+    # SESSION_EXPIRE_SECONDS once less than the threshold remains.
+    SESSION_SLIDING_EXPIRY: bool = (
+        os.getenv("SESSION_SLIDING_EXPIRY", "false").lower() == "true"
+    )
+    SESSION_REFRESH_THRESHOLD_SECONDS: int = int(
+        os.getenv("SESSION_REFRESH_THRESHOLD_SECONDS", SESSION_EXPIRE_SECONDS // 2)
+    )
+
+    # Per-worker session cache in front of Redis
+    SESSION_LOCAL_CACHE_ENABLED: bool = (
+        os.getenv("SESSION_LOCAL_CACHE_ENABLED", "false").lower() == "true"
+    )
+    SESSION_LOCAL_CACHE_SIZE: int = int(os.getenv("SESSION_LOCAL_CACHE_SIZE", 10000))
+    SESSION_LOCAL_CACHE_TTL: float = float(os.getenv("SESSION_LOCAL_CACHE_TTL", 30))
+    SESSION_INVALIDATION_CHANNEL: str = os.getenv(
+        "SESSION_INVALIDATION_CHANNEL", "session_invalidations"
+    )
+
+    # Password hashing
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(
+        os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+    # Argon2id cost (memory in KiB); pick values with scripts/calibrate_password_hash.py
+    ARGON2_MEMORY_COST: int = int(os.getenv("ARGON2_MEMORY_COST", 19456))
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", 2))
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", 1))
 
     # Database / Celery
     DATABASE_URL_WRITER: str | None = os.getenv("DATABASE_URL_WRITER")
     DATABASE_URL_READER: str | None = os.getenv("DATABASE_URL_READER")
     CELERY_DATABASE_URL_WRITER: str | None = os.getenv("DATABASE_URL_WRITER")
     CELERY_DATABASE_URL_READER: str | None = os.getenv("DATABASE_URL_READER")
+    # Celery engines live in each worker process. NullPool opens a connection
+    # per session and leaves pooling to PgBouncer.
+    CELERY_DB_NULLPOOL: bool = os.getenv("CELERY_DB_NULLPOOL", "false").lower() == "true"
+    CELERY_DB_POOL_SIZE: int = int(os.getenv("CELERY_DB_POOL_SIZE", 1))
+    CELERY_DB_MAX_OVERFLOW: int = int(os.getenv("CELERY_DB_MAX_OVERFLOW", 2))
+    # Async task bodies running at once on a worker process's event loop
+    CELERY_ASYNC_MAX_IN_FLIGHT: int = int(os.getenv("CELERY_ASYNC_MAX_IN_FLIGHT", 16))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    # Seconds before a pooled connection is replaced; -1 keeps them forever
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    # "off": direct PostgreSQL connections, statement caches on.
+    # "transaction": PgBouncer transaction pooling without prepared statement
+    # support; every query is planned again.
+    # "prepared": PgBouncer >= 1.21 with max_prepared_statements set; caches
+    # stay on and statement names are unique across client connections.
+    DB_PGBOUNCER_MODE: str = os.getenv("DB_PGBOUNCER_MODE", "off")
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    # Routing sessions read from the replica unless the client committed
+    # within DB_READ_YOUR_WRITES_SECONDS or replay lag exceeds the limit
+    DB_READ_YOUR_WRITES_SECONDS: float = float(
+        os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5)
+    )
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 1))
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = float(
+        os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", 5)
+    )
+
+    # How paginated lists find total_count: exact, window, cached or
+    # estimated (see app.services.pagination.paginate)
+    PAGINATION_COUNT_MODE: str = os.getenv("PAGINATION_COUNT_MODE", "exact")
+    PAGINATION_COUNT_CACHE_TTL: int = int(os.getenv("PAGINATION_COUNT_CACHE_TTL", 60))
+    PAGINATION_ESTIMATE_MIN_ROWS: int = int(
+        os.getenv("PAGINATION_ESTIMATE_MIN_ROWS", 10000)
+    )
+
+    # Blog search: "trigram" (ILIKE / pg_trgm on transliterated titles) or "fulltext"
+    # (weighted tsvector over title and paragraphs, GIN indexed)
+    SEARCH_ENGINE: str = os.getenv("SEARCH_ENGINE", "trigram")
+
+    # Seconds a blog list response stays cached in Redis; 0 disables the
+    # cache. Admin blog changes invalidate every entry at once.
+    BLOG_LIST_CACHE_TTL: int = int(os.getenv("BLOG_LIST_CACHE_TTL", 60))
 
     # Redis
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379")
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    # Seconds to wait for a free pooled connection before failing
+    REDIS_POOL_TIMEOUT: float = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = float(
+        os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 2)
+    )
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+    # Read replicas of REDIS_URL for session, sitemap and home page lookups.
+    # Keys written in the last REDIS_READ_YOUR_WRITES_SECONDS are read from
+    # the primary on every worker.
+    REDIS_REPLICA_URLS: list[str] = [
+        url.strip()
+        for url in os.getenv("REDIS_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    REDIS_READ_YOUR_WRITES_SECONDS: float = float(
+        os.getenv("REDIS_READ_YOUR_WRITES_SECONDS", 2)
+    )
+    # Session keyspace placement:
+    # "single": everything on REDIS_URL.
+    # "cluster": Redis Cluster reached through SESSION_REDIS_NODES (first node
+    # is used for discovery); a user's keys share one slot via hash tags.
+    # "sharded": client-side consistent hashing over SESSION_REDIS_NODES.
+    # Pub/sub invalidations and revocations always stay on REDIS_URL.
+    SESSION_STORE_MODE: str = os.getenv("SESSION_STORE_MODE", "single")
+    SESSION_REDIS_NODES: list[str] = [
+        url.strip()
+        for url in os.getenv("SESSION_REDIS_NODES", "").split(",")
+        if url.strip()
+    ]
+    SESSION_HASH_RING_REPLICAS: int = int(os.getenv("SESSION_HASH_RING_REPLICAS", 160))
+    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
+    CELERY_RESULT_BACKEND: str = os.getenv(
+        "CELERY_RESULT_BACKEND", "redis://redis:6379/0"
+    )
 
     # Mail
     MAIL_HOST: str = os.getenv("MAIL_HOST", "localhost")
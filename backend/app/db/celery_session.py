@@ -1,24 +1,65 @@
 from app.core.settings import settings
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.db.engines import create_engine
 
-engine_writer = create_async_engine(settings.CELERY_DATABASE_URL_WRITER, echo=False)
-engine_reader = create_async_engine(settings.CELERY_DATABASE_URL_READER, echo=False)
 
-AsyncSessionLocalWriter = sessionmaker(
-    bind=engine_writer, class_=AsyncSession, expire_on_commit=False
-)
+class CeleryDatabase:
+    """
+    Async engines of one Celery worker process. Built in worker_process_init,
+    after the fork and next to the process's event loop, and disposed on
+    worker_process_shutdown, so no connection is shared between processes.
+    """
 
-AsyncSessionLocalReader = sessionmaker(
-    bind=engine_reader, class_=AsyncSession, expire_on_commit=False
-)
+    def __init__(self):
+        self.engine_writer: AsyncEngine | None = None
+        self.engine_reader: AsyncEngine | None = None
+        self.writer_sessions: sessionmaker | None = None
+        self.reader_sessions: sessionmaker | None = None
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        if settings.CELERY_DB_NULLPOOL:
+            return create_engine(url, poolclass=NullPool)
+        return create_engine(
+            url,
+            pool_size=settings.CELERY_DB_POOL_SIZE,
+            max_overflow=settings.CELERY_DB_MAX_OVERFLOW,
+        )
+
+    def init(self):
+        if self.engine_writer is not None:
+            return
+        self.engine_writer = self._create_engine(settings.CELERY_DATABASE_URL_WRITER)
+        self.engine_reader = self._create_engine(settings.CELERY_DATABASE_URL_READER)
+        self.writer_sessions = sessionmaker(
+            bind=self.engine_writer, class_=AsyncSession, expire_on_commit=False
+        )
+        self.reader_sessions = sessionmaker(
+            bind=self.engine_reader, class_=AsyncSession, expire_on_commit=False
+        )
+
+    async def dispose(self):
+        for engine in (self.engine_writer, self.engine_reader):
+            if engine is not None:
+                await engine.dispose()
+        self.engine_writer = None
+        self.engine_reader = None
+        self.writer_sessions = None
+        self.reader_sessions = None
+
+
+celery_db = CeleryDatabase()
 
 
 async def get_write_session():
-    async with AsyncSessionLocalWriter() as session:
+    # Lazy init covers pools without worker_process_init (e.g. -P solo)
+    celery_db.init()
+    async with celery_db.writer_sessions() as session:
         yield session
 
 
 async def get_read_session():
-    async with AsyncSessionLocalReader() as session:
+    celery_db.init()
+    async with celery_db.reader_sessions() as session:
         yield session
@@ -0,0 +1,91 @@
+import time
+import uuid
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from app.core.settings import settings
+
+PGBOUNCER_MODES = ("off", "transaction", "prepared")
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            # Includes opening a new connection when the pool has room
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def _connect_args() -> dict:
+    mode = settings.DB_PGBOUNCER_MODE
+    if mode not in PGBOUNCER_MODES:
+        raise ValueError(f"Unknown DB_PGBOUNCER_MODE: {mode}")
+    if mode == "off":
+        return {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    # asyncpg names statements per connection; behind PgBouncer several
+    # clients share one server connection, so names must be globally unique
+    connect_args = {"prepared_statement_name_func": _unique_statement_name}
+    if mode == "transaction":
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+    else:
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return connect_args
+
+
+def create_engine(url: str, **kwargs) -> AsyncEngine:
+    """Async engine with the pool and statement cache settings applied"""
+    options = {
+        "echo": False,
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_args": _connect_args(),
+    }
+    options.update(kwargs)
+    if options["poolclass"] is NullPool:
+        for name in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(name)
+    return create_async_engine(url, **options)
+
+
+def pool_metrics(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, TimedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "avg_wait_ms": round(pool.wait_seconds / pool.checkouts * 1000, 3)
+        if pool.checkouts
+        else 0.0,
+        "max_wait_ms": round(pool.max_wait_seconds * 1000, 3),
+    }
@@ -1,5 +1,22 @@
 from app.db.session import Base
-from sqlalchemy import Column, Integer, String, Text, ARRAY, DateTime, func
+from sqlalchemy import Column, Computed, Integer, String, Text, ARRAY, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, load_only
+
+EXCERPT_LENGTH = 160
+
+# Title ranks above body text. 'simple' because PostgreSQL ships no Bulgarian
+# dictionary; immutable_array_to_string is created by the migration since
+# array_to_string is not immutable and cannot appear in a generated column.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', immutable_array_to_string(paragraphs, ' ')), 'B')"
+)
+
+
+def make_excerpt(paragraphs: list[str]) -> str:
+    return paragraphs[0][:EXCERPT_LENGTH] if paragraphs else ""
+
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
@@ -9,6 +26,39 @@ class BlogPost(Base):
     slug = Column(String(250), unique=True, index=True, nullable=False)
     image = Column(String(500), nullable=True)
     paragraphs = Column(ARRAY(Text), nullable=False)
+    # Start of the first paragraph, so list pages never load paragraphs
+    excerpt = Column(String(EXCERPT_LENGTH), nullable=False, server_default="")
     authored_by = Column(String(200), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Title with its Latin and Cyrillic transliterations (search_keys()),
+    # set on every save for the trigram search engine
+    search_text = deferred(Column(Text, nullable=False, server_default=""))
+    # Only used in WHERE / ORDER BY, never loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    __table_args__ = (
+        # Keyset pagination over the default -created_at ordering
+        Index("ix_blog_posts_created_at_id", "created_at", "id"),
+        Index("ix_blog_posts_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_blog_posts_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+
+def summary_columns():
+    """load_only() option for BlogPostSummary rows; paragraphs stay unloaded"""
+    return load_only(
+        BlogPost.id,
+        BlogPost.slug,
+        BlogPost.title,
+        BlogPost.image,
+        BlogPost.excerpt,
+        BlogPost.authored_by,
+        BlogPost.created_at,
+        BlogPost.updated_at,
+    )
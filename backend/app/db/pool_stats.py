@@ -0,0 +1,92 @@
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+
+class RequestPoolUsage:
+    """Connections one request checked out of the DB pools, and for how long"""
+
+    __slots__ = ("checkouts", "held_seconds")
+
+    def __init__(self):
+        self.checkouts = 0
+        self.held_seconds = 0.0
+
+
+current_pool_usage: ContextVar[RequestPoolUsage | None] = ContextVar(
+    "current_pool_usage", default=None
+)
+
+
+class EndpointPoolStats:
+    """Per-endpoint totals of RequestPoolUsage, exposed on /admin/metrics"""
+
+    def __init__(self):
+        # endpoint -> [requests, checkouts, max checkouts, held seconds]
+        self._endpoints: dict[str, list] = {}
+
+    def record(self, endpoint: str, usage: RequestPoolUsage):
+        stats = self._endpoints.setdefault(endpoint, [0, 0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += usage.checkouts
+        stats[2] = max(stats[2], usage.checkouts)
+        stats[3] += usage.held_seconds
+
+    def metrics(self) -> dict:
+        return {
+            endpoint: {
+                "requests": requests,
+                "checkouts_per_request": round(checkouts / requests, 3),
+                "max_checkouts": max_checkouts,
+                "held_ms_per_request": round(held / requests * 1000, 3),
+            }
+            for endpoint, (requests, checkouts, max_checkouts, held) in sorted(
+                self._endpoints.items()
+            )
+        }
+
+
+endpoint_pool_stats = EndpointPoolStats()
+
+
+def instrument_engine(engine):
+    """Attribute pool checkouts of an async engine to the current request"""
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        usage = current_pool_usage.get()
+        if usage is not None:
+            usage.checkouts += 1
+            connection_record.info["pool_usage"] = (usage, time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out = connection_record.info.pop("pool_usage", None)
+        if checked_out is not None:
+            usage, checked_out_at = checked_out
+            usage.held_seconds += time.perf_counter() - checked_out_at
+
+
+class PoolUsageMiddleware:
+    """
+    ASGI middleware recording pool usage per route. Plain ASGI rather than
+    BaseHTTPMiddleware so connections released by dependency teardown are
+    still counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        usage = RequestPoolUsage()
+        token = current_pool_usage.set(usage)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_pool_usage.reset(token)
+            route = scope.get("route")
+            endpoint = f"{scope['method']} {route.path}" if route else "unmatched"
+            endpoint_pool_stats.record(endpoint, usage)
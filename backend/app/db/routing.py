@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+from fastapi import Cookie
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.settings import settings
+from app.core.redis_client import get_redis_client
+from app.db.session import engine_reader, engine_writer
+
+PIN_KEY_PREFIX = "db_primary_pin:"
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary is not lag) or the
+# reader is not a replica at all.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class ReplicaLagMonitor:
+    """Polls the reader's replay lag in the background"""
+
+    def __init__(self, max_lag: float, interval: float):
+        self.max_lag = max_lag
+        self.interval = interval
+        self.lag: float | None = None
+        self.failures = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def lagging(self) -> bool:
+        return self.lag is not None and self.lag > self.max_lag
+
+    async def check(self):
+        try:
+            async with engine_reader.connect() as conn:
+                self.lag = float((await conn.execute(REPLICA_LAG_QUERY)).scalar())
+        except Exception as e:
+            # An unreachable replica is treated as infinitely behind
+            print(f"Replica lag check failed: {e}")
+            self.failures += 1
+            self.lag = float("inf")
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag,
+            "lagging": self.lagging,
+            "check_failures": self.failures,
+            "reader_binds": RoutingSession.reader_binds,
+            "writer_binds": RoutingSession.writer_binds,
+        }
+
+
+replica_lag = ReplicaLagMonitor(
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to the replica and writes to the primary. Once the session has
+    written, or info["use_writer"] is set, every statement goes to the primary
+    so the session reads its own writes; so does everything while the replica
+    is lagging.
+    """
+
+    reader_binds = 0
+    writer_binds = 0
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (
+            clause is not None
+            and (
+                getattr(clause, "is_dml", False)
+                or getattr(clause, "_for_update_arg", None) is not None
+            )
+        ):
+            self.info["wrote"] = True
+        if self.info.get("wrote") or self.info.get("use_writer") or replica_lag.lagging:
+            RoutingSession.writer_binds += 1
+            return engine_writer.sync_engine
+        RoutingSession.reader_binds += 1
+        return engine_reader.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_committed(session):
+    if session.info.get("wrote"):
+        session.info["committed"] = True
+
+
+AsyncSessionLocalRouting = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+)
+
+
+def _pin_key(client_id: str) -> str:
+    return PIN_KEY_PREFIX + hashlib.sha256(client_id.encode()).hexdigest()[:32]
+
+
+async def pin_db_reads(client_id: str | None):
+    """
+    Keep routing sessions of a client (its session or anonymous session cookie)
+    on the primary for DB_READ_YOUR_WRITES_SECONDS
+    """
+    if not client_id or settings.DB_READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    redis = await get_redis_client()
+    await redis.set(
+        _pin_key(client_id), 1, px=int(settings.DB_READ_YOUR_WRITES_SECONDS * 1000)
+    )
+
+
+async def get_routing_session(
+    session_id: str | None = Cookie(None),
+    anonymous_session_id: str | None = Cookie(None),
+):
+    client_id = session_id or anonymous_session_id
+    async with AsyncSessionLocalRouting() as session:
+        if client_id and settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+            redis = await get_redis_client()
+            if await redis.exists(_pin_key(client_id)):
+                session.info["use_writer"] = True
+        yield session
+        if session.info.get("committed"):
+            await pin_db_reads(client_id)
@@ -1,9 +1,13 @@
 from app.core.settings import settings
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app.db.engines import create_engine
+from app.db.pool_stats import instrument_engine
 
-engine_writer = create_async_engine(settings.DATABASE_URL_WRITER, echo=False)
-engine_reader = create_async_engine(settings.DATABASE_URL_READER, echo=False)
+engine_writer = create_engine(settings.DATABASE_URL_WRITER)
+engine_reader = create_engine(settings.DATABASE_URL_READER)
+instrument_engine(engine_writer)
+instrument_engine(engine_reader)
 
 AsyncSessionLocalWriter = sessionmaker(
     bind=engine_writer,
@@ -20,6 +24,9 @@ AsyncSessionLocalReader = sessionmaker(
 Base = declarative_base()
 
 
+# An AsyncSession only checks out a connection on its first statement and
+# returns it on commit/rollback, so an unused dependency costs no pool slot;
+# commit read-only work early to release the connection before slow steps.
 async def get_write_session():
     async with AsyncSessionLocalWriter() as session:
         yield session
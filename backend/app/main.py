@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
@@ -9,6 +10,7 @@ from starlette.middleware.sessions import SessionMiddleware
 from app.api.admin.admin import router as admin_router
 from app.api.admin.analytics import router as admin_analytics_router
 from app.api.admin.blogs import router as admin_blogs_router
+from app.api.admin.metrics import router as admin_metrics_router
 
 from app.core.permissions import is_admin_authenticated
 from app.api.users.users import router as users_router
@@ -18,8 +20,29 @@ from app.api.sitemap import router as sitemap_router
 from app.api.home import router as home_router
 
 from app.admin import setup_admin
+from app.core.redis_client import redis_manager
+from app.db.routing import replica_lag
+from app.db.pool_stats import PoolUsageMiddleware
+from app.services.hashing import password_hasher
+from app.services.session_cache import session_cache
+from app.services.session_store import session_store
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await redis_manager.startup()
+    await session_store.startup()
+    session_cache.start()
+    replica_lag.start()
+    yield
+    await replica_lag.stop()
+    await session_cache.stop()
+    await session_store.shutdown()
+    await redis_manager.shutdown()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 class AdminAuthMiddleware(BaseHTTPMiddleware):
@@ -60,12 +83,14 @@ app.include_router(social_router, prefix="/users", tags=["users"])
 app.include_router(admin_router, prefix="/admin", tags=["admin"])
 app.include_router(admin_analytics_router, prefix="/admin", tags=["admin"])
 app.include_router(admin_blogs_router, prefix="/admin/blogs", tags=["admin"])
+app.include_router(admin_metrics_router, prefix="/admin", tags=["admin"])
 
 # Blogposts routers
 app.include_router(blogs_router, prefix="/blogposts", tags=["Blogposts"])
 
 # Add middleware after routers
 app.add_middleware(AdminAuthMiddleware)
+app.add_middleware(PoolUsageMiddleware)
 
 # Setup SQLAdmin
 setup_admin(app)
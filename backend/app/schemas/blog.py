@@ -51,6 +51,29 @@ class BlogPostOut(BlogPostBase):
     }
 
 
+class BlogPostSummary(BaseModel):
+    """List item: the post without its paragraphs"""
+    id: int
+    slug: str
+    title: str
+    image: Optional[str] = None
+    excerpt: str
+    authored_by: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    # Highlighted search match, fulltext search only
+    snippet: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class BlogPostSuggestion(BaseModel):
+    slug: str
+    title: str
+
+
 # ===============================
 # List Query (Pagination + Search)
 # ===============================
@@ -71,11 +94,16 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     total_count: int
-    current_page: int
+    # False when total_count is cached or a planner estimate
+    total_count_exact: bool = True
+    # None for cursor pagination
+    current_page: Optional[int]
     page_size: int
     total_pages: int
     items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
-class BlogPostsWithAuthors(PaginatedResponse[BlogPostOut]):
+class BlogPostsWithAuthors(PaginatedResponse[BlogPostSummary]):
     authors: List[str] = []
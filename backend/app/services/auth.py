@@ -1,43 +1,49 @@
 from app.core.settings import settings
 import secrets
-import json
+import time
 from datetime import datetime, timezone
 from fastapi import HTTPException, status, Cookie
+from itsdangerous import TimestampSigner
 from sqlalchemy.future import select
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from passlib.context import CryptContext
 from app.schemas.user import UserCreate
 from app.db.models.user import User
-from app.core.redis_client import get_redis_client
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.hashing import password_hasher
+from app.services.session_cache import session_cache
+from app.services.session_serializer import dumps_session, loads_session
+from app.services.session_store import session_store
+from app.services.session_tokens import (
+    is_session_token,
+    issue_session_token,
+    read_session_token,
+)
 
 
 def isoformat_z(dt: datetime) -> str:
     return dt.replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password + settings.PEPPER)
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password + settings.PEPPER)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password + settings.PEPPER, hashed_password)
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_hasher.verify_and_update(
+        plain_password + settings.PEPPER, hashed_password
+    )
 
 
 # ------------------------------
 # User management
 # ------------------------------
 async def create_user(user_create: UserCreate, db: AsyncSession) -> User:
-    result = await db.execute(select(User).filter(User.email == user_create.email))
-    existing_user = result.scalars().first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Акаунт с този имейл вече съществува",
-        )
-
-    hashed_password = hash_password(user_create.password)
+    # The unique email constraint on the primary is the authoritative check;
+    # callers may have looked for an existing user on a lagging replica.
+    hashed_password = await hash_password(user_create.password)
     new_user = User(
         email=user_create.email,
         hashed_password=hashed_password,
@@ -45,65 +51,300 @@ async def create_user(user_create: UserCreate, db: AsyncSession) -> User:
         last_name=user_create.last_name,
     )
     db.add(new_user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Акаунт с този имейл вече съществува",
+        )
     await db.refresh(new_user)
     return new_user
 
 
-async def authenticate_user(email: str, password: str, db: AsyncSession) -> User | None:
+async def authenticate_user(
+    email: str,
+    password: str,
+    db: AsyncSession,
+    db_write: AsyncSession | None = None,
+) -> User | None:
     result = await db.execute(select(User).filter(User.email == email))
     user = result.scalars().first()
-    if not user or not verify_password(password, user.hashed_password):
+    # Hand the connection back before the deliberately slow hash check
+    await db.commit()
+    if not user:
         return None
+
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
+        return None
+
+    # Transparently upgrade outdated hashes (e.g. bcrypt -> argon2id)
+    if new_hash and db_write is not None:
+        await db_write.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+        await db_write.commit()
     return user
 
 
 # ------------------------------
 # Session management
 # ------------------------------
-async def _set_session(key: str, data: dict):
-    redis = await get_redis_client()
-    await redis.set(key, json.dumps(data))
-    await redis.expire(key, settings.SESSION_EXPIRE_SECONDS)
+# Returns {value, ttl, touched}; extends the TTL only when it has dropped
+# below the threshold, so the read and the throttled touch are one round trip.
+# A touched user session also gets its user_sessions index member re-scored
+# and the index TTL extended, so logout-all still finds it. KEYS[2] is the
+# index key when the session id carries the user id (same hash tag); plain
+# ids are single-node, and the user id is read from the stored value
+# (JSON, or msgpack v1 with the user id under "u").
+TOUCH_SESSION_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return nil
+end
+local ttl = redis.call('TTL', KEYS[1])
+if ttl >= 0 and ttl < tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    local index_key = KEYS[2]
+    if not index_key and ARGV[4] ~= '' then
+        local ok, data
+        if string.byte(value, 1) == 1 then
+            ok, data = pcall(cmsgpack.unpack, string.sub(value, 2))
+            data = ok and type(data) == 'table' and {user_id = data.u} or nil
+        else
+            ok, data = pcall(cjson.decode, value)
+            data = ok and type(data) == 'table' and data or nil
+        end
+        if data and type(data.user_id) == 'string' and data.user_id ~= '' then
+            index_key = ARGV[4] .. '{' .. data.user_id .. '}'
+        end
+    end
+    if index_key then
+        redis.call('ZADD', index_key, 'XX', ARGV[5], ARGV[3])
+        redis.call('EXPIRE', index_key, ARGV[6])
+    end
+    return {value, tonumber(ARGV[2]), 1}
+end
+return {value, ttl, 0}
+"""
+_touch_session_script = None
 
+anonymous_signer = TimestampSigner(settings.SECRET_KEY, salt="anonymous-session")
 
-async def create_session(user: User) -> str:
-    """Create a regular user session"""
-    session_id = secrets.token_urlsafe(32)
-    now = datetime.utcnow()
-    session_data = {
+
+def _new_session_id(user_id: str) -> str:
+    token = secrets.token_urlsafe(32)
+    if session_store.tagged:
+        # "<user_id>:<token>": the key is tagged with the owner, see _session_key
+        return f"{user_id}:{token}"
+    return token
+
+
+def _session_key(session_id: str, anonymous: bool = False) -> str:
+    prefix = f"{'anonymous_' if anonymous else 'user_'}session:"
+    user_id, tagged, token = session_id.partition(":")
+    if tagged:
+        return f"{prefix}{{{user_id}}}:{token}"
+    return f"{prefix}{session_id}"
+
+
+def _session_expire_seconds(anonymous: bool = False) -> int:
+    if anonymous:
+        return settings.ANONYMOUS_SESSION_EXPIRE_SECONDS
+    return settings.SESSION_EXPIRE_SECONDS
+
+
+def _resolve_session_id(session_id: str) -> str | None:
+    """Map a cookie value (opaque id or signed token) to the stored session id"""
+    if settings.SESSION_BACKEND == "signed" and is_session_token(session_id):
+        token = read_session_token(session_id)
+        return token[0] if token else None
+    return session_id
+
+
+USER_INDEX_PREFIX = "user_sessions:"
+
+
+def _user_index_key(user_id: str) -> str:
+    """
+    Sorted set of a user's session ids, scored by expiry timestamp. The hash
+    tag keeps it on the same cluster slot / shard as the user's sessions.
+    """
+    return f"{USER_INDEX_PREFIX}{{{user_id}}}"
+
+
+def _user_session_data(user: User) -> dict:
+    return {
         "user_id": str(user.id),
         "email": user.email,
         "first_name": user.first_name,
         "last_name": user.last_name,
         "role": user.role,
         "profile_picture": user.profile_picture,
-        "created_at": isoformat_z(now),
     }
-    await _set_session(f"user_session:{session_id}", session_data)
-    return session_id
 
 
-async def create_anonymous_session() -> str:
-    """Create an anonymous session"""
-    anonymous_session_id = secrets.token_urlsafe(32)
+async def _set_session(
+    session_id: str,
+    data: dict,
+    anonymous: bool = False,
+    replace_anonymous_session_id: str | None = None,
+    new: bool = False,
+):
+    """
+    Write a session and everything that goes with it in a single MULTI/EXEC:
+    SET with EX (no window without a TTL), per-user index update, removal of
+    the replaced anonymous session and the cache invalidations.
+
+    With a cluster or sharded session store the pipeline is not transactional
+    and an anonymous session on another node is deleted right after it.
+    """
+    key = _session_key(session_id, anonymous)
+    async with session_store.pipeline(key) as pipe:
+        pipe.set(key, dumps_session(data), ex=_session_expire_seconds(anonymous))
+        if data.get("user_id"):
+            _queue_index_session(pipe, data["user_id"], session_id)
+        if replace_anonymous_session_id:
+            anonymous_key = _session_key(replace_anonymous_session_id, anonymous=True)
+            pipe.delete_key(anonymous_key)
+            pipe.invalidate(anonymous_key)
+        if not new:
+            # A freshly generated key cannot be cached or revoked anywhere yet
+            pipe.invalidate(key)
+        await pipe.execute()
+
+
+def _queue_index_session(pipe, user_id: str, session_id: str):
+    index_key = _user_index_key(user_id)
+    now = time.time()
+    pipe.zadd(index_key, {session_id: now + settings.SESSION_EXPIRE_SECONDS})
+    # Lazily trim ids whose sessions have already expired
+    pipe.zremrangebyscore(index_key, "-inf", now)
+    pipe.expire(index_key, settings.SESSION_EXPIRE_SECONDS)
+
+
+async def _get_user_session_ids(redis, user_id: str) -> list[str]:
+    index_key = _user_index_key(user_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zremrangebyscore(index_key, "-inf", time.time())
+        pipe.zrange(index_key, 0, -1)
+        _, session_ids = await pipe.execute()
+    return [session_id.decode() for session_id in session_ids]
+
+
+async def create_session(
+    user: User,
+    user_agent: str | None = None,
+    replace_anonymous_session_id: str | None = None,
+) -> str:
+    """
+    Create a regular user session, optionally dropping the visitor's anonymous
+    one. Returns the cookie value: the session id, or a signed token with the
+    session claims when SESSION_BACKEND is "signed".
+    """
+    session_id = _new_session_id(str(user.id))
     now = datetime.utcnow()
     session_data = {
-        "user_id": None,
-        "role": "anonymous",
+        **_user_session_data(user),
         "created_at": isoformat_z(now),
     }
-    await _set_session(f"anonymous_session:{anonymous_session_id}", session_data)
-    return anonymous_session_id
+    if user_agent:
+        session_data["user_agent"] = user_agent
+    await _set_session(
+        session_id,
+        session_data,
+        replace_anonymous_session_id=replace_anonymous_session_id,
+        new=True,
+    )
+    if settings.SESSION_BACKEND == "signed":
+        return issue_session_token(session_id, session_data)
+    return session_id
+
+
+async def create_anonymous_session() -> str:
+    """
+    Create an anonymous session id without writing to Redis; the signed
+    timestamp makes the id verifiable and lets it expire without a key.
+    """
+    return anonymous_signer.sign(secrets.token_urlsafe(24)).decode()
 
 
-async def get_session(session_id: str, anonymous: bool = False) -> dict | None:
-    redis = await get_redis_client()
-    key = f"{'anonymous_' if anonymous else 'user_'}session:{session_id}"
-    raw_data = await redis.get(key)
+async def get_session(
+    session_id: str, anonymous: bool = False, touch: bool = False
+) -> dict | None:
+    """
+    Load a session. With touch=True and SESSION_SLIDING_EXPIRY enabled the
+    session TTL is extended as part of the same round trip.
+
+    A fresh, unrevoked signed token is answered from its claims alone; older
+    tokens fall back to the session stored in Redis.
+    """
+    if not anonymous and settings.SESSION_BACKEND == "signed" and is_session_token(
+        session_id
+    ):
+        token = read_session_token(session_id)
+        if token is None:
+            return None
+        session_id, claims, age = token
+        if age < settings.SESSION_TOKEN_MAX_AGE and not session_cache.is_revoked(
+            _session_key(session_id)
+        ):
+            return claims
+
+    if touch and settings.SESSION_SLIDING_EXPIRY:
+        return await _get_and_touch_session(session_id, anonymous)
+
+    key = _session_key(session_id, anonymous)
+    cached = session_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = session_cache.generation
+    raw_data = await session_store.get(key)
     if not raw_data:
         return None
-    return json.loads(raw_data)
+    session_data = loads_session(raw_data)
+    session_cache.set(key, session_data, generation)
+    return session_data
+
+
+async def _get_and_touch_session(session_id: str, anonymous: bool) -> dict | None:
+    global _touch_session_script
+    threshold = settings.SESSION_REFRESH_THRESHOLD_SECONDS
+    key = _session_key(session_id, anonymous)
+    cached = session_cache.get(key, min_key_ttl=threshold)
+    if cached is not None:
+        return cached
+
+    generation = session_cache.generation
+    redis = await session_store.client(key)
+    if _touch_session_script is None:
+        _touch_session_script = redis.register_script(TOUCH_SESSION_SCRIPT)
+    keys = [key]
+    user_id, tagged, _ = session_id.partition(":")
+    if tagged and not anonymous:
+        keys.append(_user_index_key(user_id))
+    result = await _touch_session_script(
+        keys=keys,
+        args=[
+            threshold,
+            settings.SESSION_EXPIRE_SECONDS,
+            session_id,
+            "" if anonymous else USER_INDEX_PREFIX,
+            time.time() + settings.SESSION_EXPIRE_SECONDS,
+            settings.SESSION_EXPIRE_SECONDS,
+        ],
+        client=redis,
+    )
+    if not result:
+        return None
+
+    raw_data, ttl, _ = result
+    session_data = loads_session(raw_data)
+    session_cache.set(key, session_data, generation, key_ttl=ttl if ttl >= 0 else None)
+    return session_data
 
 
 async def get_current_user(session_id: str | None = Cookie(None)) -> dict | None:
@@ -116,29 +357,167 @@ async def get_current_user(session_id: str | None = Cookie(None)) -> dict | None
 
 async def update_session_data(session_id: str, user: User):
     """Update user session data"""
+    session_id = _resolve_session_id(session_id)
+    if not session_id:
+        return
     now = datetime.utcnow()
     session_data = {
-        "user_id": str(user.id),
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "role": user.role,
-        "profile_picture": user.profile_picture,
+        **_user_session_data(user),
         "updated_at": isoformat_z(now),
     }
-    await _set_session(f"user_session:{session_id}", session_data)
+    await _set_session(session_id, session_data)
+
+
+async def update_user_sessions(user: User) -> int:
+    """Refresh the stored user data in every active session of the user"""
+    user_id = str(user.id)
+    index_key = _user_index_key(user_id)
+    redis = await session_store.client(index_key)
+    session_ids = await _get_user_session_ids(redis, user_id)
+    if not session_ids:
+        return 0
+
+    keys = [_session_key(session_id) for session_id in session_ids]
+    raw_sessions = await redis.mget(keys)
+
+    now = isoformat_z(datetime.utcnow())
+    updated = 0
+    async with session_store.pipeline(index_key, transaction=False) as pipe:
+        for session_id, key, raw_data in zip(session_ids, keys, raw_sessions):
+            if not raw_data:
+                pipe.zrem(index_key, session_id)
+                continue
+            # Keep per-device fields (created_at, user_agent) and each session's TTL
+            session_data = {
+                **loads_session(raw_data),
+                **_user_session_data(user),
+                "updated_at": now,
+            }
+            pipe.set(key, dumps_session(session_data), keepttl=True, xx=True)
+            pipe.invalidate(key)
+            updated += 1
+        await pipe.execute()
+    return updated
+
+
+async def delete_session(
+    session_id: str, anonymous: bool = False, user_id: str | None = None
+):
+    if not anonymous:
+        session_id = _resolve_session_id(session_id)
+        if not session_id:
+            return
+    key = _session_key(session_id, anonymous)
+    if not anonymous and not user_id:
+        session_data = await get_session(session_id)
+        user_id = session_data.get("user_id") if session_data else None
+    async with session_store.pipeline(key) as pipe:
+        pipe.delete(key)
+        if user_id:
+            pipe.zrem(_user_index_key(user_id), session_id)
+        pipe.invalidate(key)
+        await pipe.execute()
 
 
-async def delete_session(session_id: str, anonymous: bool = False):
-    redis = await get_redis_client()
-    key = f"{'anonymous_' if anonymous else 'user_'}session:{session_id}"
-    await redis.delete(key)
+async def revoke_user_sessions(user_id: str, keep_session_id: str | None = None) -> int:
+    """Log a user out of every device, optionally keeping one session"""
+    if keep_session_id:
+        keep_session_id = _resolve_session_id(keep_session_id)
+    index_key = _user_index_key(user_id)
+    redis = await session_store.client(index_key)
+    session_ids = [
+        session_id
+        for session_id in await _get_user_session_ids(redis, user_id)
+        if session_id != keep_session_id
+    ]
+    if not session_ids:
+        return 0
 
+    async with session_store.pipeline(index_key, transaction=False) as pipe:
+        for session_id in session_ids:
+            key = _session_key(session_id)
+            pipe.delete(key)
+            pipe.invalidate(key)
+        pipe.zrem(index_key, *session_ids)
+        await pipe.execute()
+    return len(session_ids)
 
-async def extend_session_expiry(session_id: str, anonymous: bool = False) -> bool:
-    redis = await get_redis_client()
-    key = f"{'anonymous_' if anonymous else 'user_'}session:{session_id}"
-    if not await redis.exists(key):
-        return False
-    await redis.expire(key, settings.SESSION_EXPIRE_SECONDS)
-    return True
+
+async def list_user_sessions(
+    user_id: str, current_session_id: str | None = None
+) -> list[dict]:
+    """Active devices of a user, newest first"""
+    if current_session_id:
+        current_session_id = _resolve_session_id(current_session_id)
+    index_key = _user_index_key(user_id)
+    redis = await session_store.client(index_key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zremrangebyscore(index_key, "-inf", time.time())
+        pipe.zrevrange(index_key, 0, -1, withscores=True)
+        _, entries = await pipe.execute()
+    if not entries:
+        return []
+    entries = [(session_id.decode(), expires_at) for session_id, expires_at in entries]
+
+    raw_sessions = await redis.mget([_session_key(session_id) for session_id, _ in entries])
+
+    sessions = []
+    stale_ids = []
+    for (session_id, expires_at), raw_data in zip(entries, raw_sessions):
+        if not raw_data:
+            stale_ids.append(session_id)
+            continue
+        session_data = loads_session(raw_data)
+        sessions.append(
+            {
+                "session_id": session_id,
+                "user_agent": session_data.get("user_agent"),
+                "created_at": session_data.get("created_at"),
+                "expires_at": isoformat_z(datetime.utcfromtimestamp(expires_at)),
+                "current": session_id == current_session_id,
+            }
+        )
+    if stale_ids:
+        await redis.zrem(index_key, *stale_ids)
+    return sessions
+
+
+async def extend_session_expiry(
+    session_id: str, anonymous: bool = False, user_id: str | None = None
+) -> bool:
+    if not anonymous:
+        session_id = _resolve_session_id(session_id)
+        if not session_id:
+            return False
+    key = _session_key(session_id, anonymous)
+    # EXPIRE reports whether the key existed, so no separate EXISTS is needed
+    async with session_store.pipeline(key) as pipe:
+        pipe.expire(key, _session_expire_seconds(anonymous))
+        if user_id:
+            index_key = _user_index_key(user_id)
+            pipe.zadd(
+                index_key,
+                {session_id: time.time() + settings.SESSION_EXPIRE_SECONDS},
+                xx=True,
+            )
+            # The index must outlive every session it lists
+            pipe.expire(index_key, settings.SESSION_EXPIRE_SECONDS)
+        extended, *_ = await pipe.execute()
+    return bool(extended)
+
+
+async def reissue_session_token(session_id: str) -> str | None:
+    """
+    Return the cookie value to hand back after a refresh. For signed tokens a
+    new token is issued from the session stored in Redis; opaque ids are
+    returned unchanged.
+    """
+    if settings.SESSION_BACKEND != "signed":
+        return session_id
+    stored_session_id = _resolve_session_id(session_id)
+    if not stored_session_id:
+        return None
+    session_data = await get_session(stored_session_id)
+    if not session_data:
+        return None
+    return issue_session_token(stored_session_id, session_data)
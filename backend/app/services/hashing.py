@@ -0,0 +1,126 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.core.settings import settings
+
+# Argon2id is the primary scheme; bcrypt stays verifiable and is marked
+# deprecated so existing hashes report needs_update() and get upgraded on login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+# ------------------------------
+# Worker functions (module level so they can be pickled for process pools)
+# ------------------------------
+def _timed_hash(secret: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    hashed = pwd_context.hash(secret)
+    return hashed, time.perf_counter() - started
+
+
+def _timed_verify_and_update(
+    secret: str, hashed: str
+) -> tuple[tuple[bool, str | None], float]:
+    started = time.perf_counter()
+    valid = pwd_context.verify(secret, hashed)
+    new_hash = None
+    if valid and pwd_context.needs_update(hashed):
+        new_hash = pwd_context.hash(secret)
+    return (valid, new_hash), time.perf_counter() - started
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a bounded worker pool so the
+    CPU-heavy work never blocks the event loop.
+    """
+
+    def __init__(self, executor_type: str, max_workers: int, max_queue: int):
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._run_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        # Everything in flight beyond max_workers is waiting in the executor queue
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, run_seconds = await loop.run_in_executor(
+                self._get_executor(), fn, *args
+            )
+        finally:
+            self._in_flight -= 1
+
+        self._completed += 1
+        self._run_seconds += run_seconds
+        self._wait_seconds += max(time.perf_counter() - started - run_seconds, 0.0)
+        return result
+
+    async def hash(self, secret: str) -> str:
+        return await self._run(_timed_hash, secret)
+
+    async def verify_and_update(self, secret: str, hashed: str) -> tuple[bool, str | None]:
+        """Verify and, if the hash uses outdated settings, return a fresh hash."""
+        return await self._run(_timed_verify_and_update, secret, hashed)
+
+    def metrics(self) -> dict:
+        completed = self._completed or 1
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self.max_workers, 0),
+            "peak_in_flight": self._peak_in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_run_ms": round(self._run_seconds / completed * 1000, 2),
+            "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
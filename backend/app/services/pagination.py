@@ -1,8 +1,178 @@
-from sqlalchemy import select, func
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, and_, or_, text, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators
 from pydantic import BaseModel
 from typing import Type
 
+from app.core.redis_client import get_redis_client, redis_manager
+from app.core.settings import settings
+
+COUNT_MODES = ("exact", "window", "cached", "estimated")
+COUNT_CACHE_PREFIX = "pagination_count:"
+
+
+def _keyset_columns(model, ordering: list | None) -> list[tuple]:
+    """(column, descending) pairs of the ordering plus the id tiebreaker"""
+    columns = []
+    for clause in ordering or []:
+        descending = getattr(clause, "modifier", None) is operators.desc_op
+        column = getattr(clause, "element", clause)
+        if getattr(column, "nullable", True):
+            # NULLs never compare, rows would silently drop out of the pages;
+            # computed orderings (no nullable flag) have no value to resume from
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cursor pagination is not supported for ordering by {column.key}",
+            )
+        columns.append((column, descending))
+    if not any(column.key == "id" for column, _ in columns):
+        # Ties on the ordering columns are broken by id in the same direction
+        descending = columns[0][1] if columns else False
+        columns.append((model.id, descending))
+    return columns
+
+
+def _ordering_signature(columns: list[tuple]) -> list[str]:
+    return [f"{'-' if descending else ''}{column.key}" for column, descending in columns]
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(columns: list[tuple], item, backward: bool = False) -> str:
+    payload = {
+        "o": _ordering_signature(columns),
+        "v": [_encode_value(getattr(item, column.key)) for column, _ in columns],
+    }
+    if backward:
+        payload["b"] = 1
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(columns: list[tuple], cursor: str) -> tuple[list, bool]:
+    """Return (row values, backward) of an opaque cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(value) for value in payload["v"]]
+        valid = payload["o"] == _ordering_signature(columns) and len(values) == len(
+            columns
+        )
+    except (ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return values, bool(payload.get("b"))
+
+
+def _keyset_filter(columns: list[tuple], values: list, backward: bool):
+    """Rows strictly after (or before, when backward) the cursor row"""
+    directions = {descending for _, descending in columns}
+    if len(directions) == 1:
+        # Uniform direction: a row comparison the (cols..., id) index can serve
+        row = tuple_(*[column for column, _ in columns])
+        if directions.pop() != backward:
+            return row < tuple_(*values)
+        return row > tuple_(*values)
+
+    # Mixed directions: (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for index, (column, descending) in enumerate(columns):
+        equal = [columns[i][0] == values[i] for i in range(index)]
+        after = column < values[index] if descending != backward else column > values[index]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+async def _exact_count(model, db: AsyncSession, filters: list) -> int:
+    total_query = select(func.count()).select_from(model)
+    if filters:
+        total_query = total_query.where(*filters)
+    total_result = await db.execute(total_query)
+    return total_result.scalar_one()
+
+
+def _count_cache_key(model, filters: list) -> str:
+    query = select(func.count()).select_from(model)
+    if filters:
+        query = query.where(*filters)
+    compiled = query.compile(dialect=postgresql.dialect())
+    signature = compiled.string + json.dumps(compiled.params, default=str, sort_keys=True)
+    digest = hashlib.sha256(signature.encode()).hexdigest()
+    return f"{COUNT_CACHE_PREFIX}{model.__tablename__}:{digest}"
+
+
+async def _cached_count(model, db: AsyncSession, filters: list) -> tuple[int, bool]:
+    """Exact count shared for PAGINATION_COUNT_CACHE_TTL per filter set"""
+    key = _count_cache_key(model, filters)
+    redis_read = await redis_manager.get_read_client(key)
+    cached = await redis_read.get(key)
+    if cached is not None:
+        # May lag behind writes made within the TTL
+        return int(cached), False
+
+    total_count = await _exact_count(model, db, filters)
+    redis = await get_redis_client()
+    await redis.set(key, total_count, ex=settings.PAGINATION_COUNT_CACHE_TTL)
+    return total_count, True
+
+
+async def _estimated_count(model, db: AsyncSession, filters: list) -> tuple[int, bool]:
+    """
+    Planner row estimate: pg_class.reltuples for the whole table, EXPLAIN of
+    the filtered query otherwise. Estimates below PAGINATION_ESTIMATE_MIN_ROWS
+    are replaced by an exact count, which is cheap at that size.
+    """
+    estimate = None
+    if not filters:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": model.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+    else:
+        try:
+            sql = (
+                select(model)
+                .where(*filters)
+                .compile(
+                    dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+                )
+            )
+        except Exception:
+            # A filter value with no literal rendering
+            sql = None
+        if sql is not None:
+            connection = await db.connection()
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+
+    # reltuples is -1 until the table is first vacuumed or analyzed
+    if estimate is None or estimate < settings.PAGINATION_ESTIMATE_MIN_ROWS:
+        return await _exact_count(model, db, filters), True
+    return int(estimate), False
+
 
 async def paginate(
     model,
@@ -17,7 +187,30 @@ async def paginate(
     schema: Type[BaseModel] | None = None,
     extra_filters: list = None,
     ordering: list = None,
+    keyset: bool = False,
+    cursor: str | None = None,
+    count_mode: str | None = None,
 ):
+    """
+    Page through model rows. With keyset=True (implied by a cursor) pages are
+    addressed by opaque next/prev cursors instead of OFFSET, so fetching a
+    deep page costs the same as the first one; current_page is then None.
+    Keyset ordering columns must be non-nullable.
+
+    count_mode (default PAGINATION_COUNT_MODE) picks how total_count is found:
+    - exact: separate count(*) query
+    - window: count(*) OVER () on the page query, one round trip; keyset
+      pages fall back to exact since the cursor filter narrows the window
+    - cached: exact count cached in Redis per filter set
+    - estimated: planner estimate for large results
+    total_count_exact is False when the count is cached or estimated.
+    """
+    count_mode = count_mode or settings.PAGINATION_COUNT_MODE
+    if count_mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {count_mode}")
+    keyset = keyset or cursor is not None
+    if keyset and count_mode == "window":
+        count_mode = "exact"
     offset = (page - 1) * page_size
     query = select(model)
 
@@ -39,32 +232,98 @@ async def paginate(
         query = query.where(*filters)
 
     # Count total
-    total_query = select(func.count()).select_from(model)
-    if filters:
-        total_query = total_query.where(*filters)
+    total_count_exact = True
+    if count_mode == "exact":
+        total_count = await _exact_count(model, db, filters)
+    elif count_mode == "cached":
+        total_count, total_count_exact = await _cached_count(model, db, filters)
+    elif count_mode == "estimated":
+        total_count, total_count_exact = await _estimated_count(model, db, filters)
 
-    total_result = await db.execute(total_query)
-    total_count = total_result.scalar_one()
+    if keyset:
+        paginated = await _paginate_keyset(
+            model, db, query, page_size, ordering, cursor, schema
+        )
+    else:
+        # Apply ordering
+        if ordering:
+            query = query.order_by(*ordering)
 
-    # Apply ordering
-    if ordering:
-        query = query.order_by(*ordering)
+        # Pagination
+        query = query.offset(offset).limit(page_size)
+        if count_mode == "window":
+            rows = (await db.execute(query.add_columns(func.count().over()))).all()
+            items = [row[0] for row in rows]
+            if rows:
+                total_count = rows[0][1]
+            elif offset:
+                # Past the last page there is no row to carry the total
+                total_count = await _exact_count(model, db, filters)
+            else:
+                total_count = 0
+        else:
+            result = await db.execute(query)
+            items = result.scalars().all()
 
-    # Pagination
-    query = query.offset(offset).limit(page_size)
-    result = await db.execute(query)
+        # Convert to Pydantic if schema is provided
+        if schema:
+            items = [schema.from_orm(item) for item in items]
+
+        paginated = {"current_page": page, "items": items}
+
+    return {
+        "total_count": total_count,
+        "total_count_exact": total_count_exact,
+        "page_size": page_size,
+        "total_pages": (total_count + page_size - 1) // page_size,
+        **paginated,
+    }
+
+
+async def _paginate_keyset(
+    model,
+    db: AsyncSession,
+    query,
+    page_size: int,
+    ordering: list | None,
+    cursor: str | None,
+    schema: Type[BaseModel] | None,
+):
+    columns = _keyset_columns(model, ordering)
+    backward = False
+    if cursor:
+        values, backward = decode_cursor(columns, cursor)
+        query = query.where(_keyset_filter(columns, values, backward))
+
+    # Walk backwards by flipping the ordering, then restore the page order
+    query = query.order_by(
+        *[
+            column.desc() if descending != backward else column.asc()
+            for column, descending in columns
+        ]
+    )
+    # One extra row tells whether there is a page beyond this one
+    result = await db.execute(query.limit(page_size + 1))
     items = result.scalars().all()
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if backward:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or backward:
+            next_cursor = encode_cursor(columns, items[-1])
+        if cursor and (has_more or not backward):
+            prev_cursor = encode_cursor(columns, items[0], backward=True)
 
     # Convert to Pydantic if schema is provided
     if schema:
         items = [schema.from_orm(item) for item in items]
 
-    total_pages = (total_count + page_size - 1) // page_size
-
     return {
-        "total_count": total_count,
-        "current_page": page,
-        "page_size": page_size,
-        "total_pages": total_pages,
+        "current_page": None,
         "items": items,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
     }
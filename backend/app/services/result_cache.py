@@ -0,0 +1,83 @@
+import hashlib
+import json
+from app.core.settings import settings
+from app.core.redis_client import get_redis_client, redis_manager
+
+
+class ResultCache:
+    """
+    Redis cache of serialized responses, keyed by request parameters.
+
+    Keys embed a generation number kept in Redis; invalidate() bumps it, so
+    every cached entry is orphaned in one INCR and left to expire by TTL.
+    A response computed before a bump is stored under the old generation
+    and never served.
+    """
+
+    def __init__(self, namespace: str, ttl: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.generation_key = f"{namespace}:generation"
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Time to answer from the cache vs. computing the response
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def lookup(self, params: dict) -> tuple[str | None, str | None]:
+        """Return (key, cached payload); key is None when caching is disabled"""
+        if not self.enabled:
+            return None, None
+        redis_read = await redis_manager.get_read_client(self.generation_key)
+        generation = await redis_read.get(self.generation_key) or "0"
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key = f"{self.namespace}:{generation}:{digest}"
+        redis_read = await redis_manager.get_read_client(key)
+        return key, await redis_read.get(key)
+
+    async def store(self, key: str | None, payload: str):
+        if key is None:
+            return
+        redis = await get_redis_client()
+        await redis.set(key, payload, ex=self.ttl)
+
+    async def invalidate(self):
+        redis = await get_redis_client()
+        await redis.incr(self.generation_key)
+        redis_manager.mark_written(self.generation_key)
+        self.invalidations += 1
+
+    def record_hit(self, seconds: float):
+        self.hits += 1
+        self.hit_seconds += seconds
+
+    def record_miss(self, seconds: float):
+        self.misses += 1
+        self.miss_seconds += seconds
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        hit_ms = self.hit_seconds / self.hits * 1000 if self.hits else 0.0
+        miss_ms = self.miss_seconds / self.misses * 1000 if self.misses else 0.0
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "avg_hit_ms": round(hit_ms, 3),
+            "avg_miss_ms": round(miss_ms, 3),
+            # Hits priced at the average cost of computing the response
+            "saved_ms": round(self.hits * max(miss_ms - hit_ms, 0.0), 1),
+        }
+
+
+blog_list_cache = ResultCache("blog_list", ttl=settings.BLOG_LIST_CACHE_TTL)
@@ -1,11 +1,135 @@
-from sqlalchemy import select, or_, and_, text, bindparam, desc, asc
+from sqlalchemy import select, or_, and_, desc, asc, func, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import ARRAY
 from transliterate import translit
+import html
 import re
 
+from app.core.settings import settings
+
 LATIN_RE = re.compile(r"[A-Za-z]")
 CYRILLIC_RE = re.compile(r"[А-Яа-я]")
+WORD_RE = re.compile(r"[^\W_]+")
+
+# Must match the configuration the search_vector column is built with.
+# Inlined rather than bound, so filtered queries can still be EXPLAINed with
+# literal values (see pagination count estimates).
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+# pg_trgm's default word_similarity_threshold
+WORD_SIMILARITY_INDEX_THRESHOLD = 0.6
+# Control characters never appear in post text, so the highlighted terms can
+# be marked up after the snippet is HTML-escaped
+HEADLINE_OPTIONS = 'StartSel="\x02", StopSel="\x03", MaxFragments=2, MinWords=5, MaxWords=20'
+
+
+def _transliterate_to(value: str, reversed: bool = False) -> str | None:
+    try:
+        if reversed:
+            return translit(value, reversed=True) if CYRILLIC_RE.search(value) else None
+        return translit(value, "bg") if LATIN_RE.search(value) else None
+    except Exception:
+        return None
+
+
+def _transliterate(search: str) -> str | None:
+    if LATIN_RE.search(search):
+        return _transliterate_to(search)
+    return _transliterate_to(search, reversed=True)
+
+
+def normalize_search(search: str | None) -> str | None:
+    """
+    Search text as both engines build their filters from it: case and
+    whitespace folded. Not transliterated, since a search and its
+    transliteration do not match the same rows; also the cache key form.
+    """
+    if not search or not search.strip():
+        return None
+    return " ".join(search.lower().split())
+
+
+def _prefix_tsquery(search: str):
+    # Operators and punctuation are dropped, every word matches as a prefix
+    words = WORD_RE.findall(search.lower())
+    if not words:
+        return None
+    return func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{word}:*" for word in words))
+
+
+def fulltext_query(search: str | None):
+    """tsquery for the search text or its transliteration, None if empty"""
+    search = normalize_search(search)
+    if not search:
+        return None
+    query = _prefix_tsquery(search)
+    if query is None:
+        return None
+    search_translit = _transliterate(search)
+    if search_translit and search_translit != search:
+        # Transliteration writes "ъ" as an apostrophe; splitting the word on
+        # it would leave one- and two-letter prefixes that match anything
+        query_translit = _prefix_tsquery(search_translit.replace("'", ""))
+        if query_translit is not None:
+            query = query.op("||")(query_translit)
+    return query
+
+
+async def search_snippets(
+    model, db: AsyncSession, search: str | None, ids: list[int], document
+) -> dict[int, str]:
+    """
+    Highlighted fragments of `document` for the rows in ids, keyed by id.
+    Matches are wrapped in <mark>; the rest of the text is HTML-escaped.
+    Only the fulltext engine produces snippets.
+    """
+    query = fulltext_query(search)
+    if settings.SEARCH_ENGINE != "fulltext" or query is None or not ids:
+        return {}
+    result = await db.execute(
+        select(
+            model.id, func.ts_headline(SEARCH_CONFIG, document, query, HEADLINE_OPTIONS)
+        ).where(model.id.in_(ids))
+    )
+    return {
+        row_id: html.escape(headline).replace("\x02", "<mark>").replace("\x03", "</mark>")
+        for row_id, headline in result.all()
+    }
+
+
+def search_forms(value: str | None) -> list[str]:
+    """Lowercased value and its Latin and Cyrillic transliterations, deduplicated"""
+    if not value:
+        return []
+    value = value.lower()
+    forms = []
+    for form in (value, _transliterate_to(value, reversed=True), _transliterate_to(value)):
+        if form and form not in forms:
+            forms.append(form)
+    return forms
+
+
+def search_keys(*values: str | None) -> str:
+    """
+    search_forms() of the values, stored next to the row so one trigram
+    query matches a search in either script.
+    """
+    keys = []
+    for value in values:
+        for form in search_forms(value):
+            if form not in keys:
+                keys.append(form)
+    return " ".join(keys)
+
+
+def _similar(col, word: str, threshold: float):
+    # word_similarity() carries the threshold in the query itself, with no
+    # session-level SET. The %> operator (pg_trgm.word_similarity_threshold,
+    # 0.6 by default) lets the trigram index narrow the rows first.
+    similar = func.word_similarity(word, col) >= threshold
+    if threshold >= WORD_SIMILARITY_INDEX_THRESHOLD:
+        return and_(col.op("%>")(word), similar)
+    return similar
+
 
 async def apply_filters_search_ordering(
     model,
@@ -15,65 +139,54 @@ async def apply_filters_search_ordering(
     filters: list | None = None,
     ordering: str = "-created_at",
     trigram_threshold: float = 0.7,
+    engine: str | None = None,
 ):
+    """
+    engine (default SEARCH_ENGINE):
+    - trigram: ILIKE / pg_trgm word similarity on search_columns; point
+      them at text stored with search_keys() to match either script
+    - fulltext: prefix match against model.search_vector (title and body),
+      which its GIN index serves; ordering="rank" sorts by ts_rank
+    ordering="rank" falls back to -created_at without a fulltext search.
+    """
     filters = filters or []
     search_columns = search_columns or []
+    engine = engine or settings.SEARCH_ENGINE
+
+    rank = None
+    if engine == "fulltext" and hasattr(model, "search_vector"):
+        query = fulltext_query(search)
+        if query is not None:
+            filters.append(model.search_vector.op("@@")(query))
+            rank = func.ts_rank(model.search_vector, query).label("rank")
+        return filters, _order_by(model, ordering, rank)
+
+    search = normalize_search(search)
+    words = search.split() if search else []
+    search_filters = []
+
+    # Apply search filters for each word
+    for word in words:
+        word_column_filters = []
+        for col in search_columns:
+            # Simple ILIKE filter, any word length
+            word_column_filters.append(col.ilike(f"%{word}%"))
+            if len(word) >= 4:
+                # Trigram similarity filter for longer words
+                word_column_filters.append(_similar(col, word, trigram_threshold))
+        search_filters.append(or_(*word_column_filters))
+    if search_filters:
+        filters.append(and_(*search_filters))
+
+    return filters, _order_by(model, ordering, rank)
 
-    # Set the pg_trgm similarity threshold
-    await db.execute(text(f"SET pg_trgm.similarity_threshold = {trigram_threshold}"))
-
-    async def build_filters(query: str):
-        if not query:
-            return None
-        words = query.strip().split()
-        if not words:
-            return None
-        search_filters = []
-
-        # Apply search filters for each word
-        for idx, word in enumerate(words):
-            word_column_filters = []
-            for col in search_columns:
-                if len(word) < 4:
-                    # Simple ILIKE filter for short words
-                    word_column_filters.append(col.ilike(f"%{word}%"))
-                else:
-                    # Trigram similarity filter for longer words
-                    word_column_filters.append(
-                        text(f"{col.key} % :word{idx}").bindparams(
-                            bindparam(f"word{idx}", word)
-                        )
-                    )
-                    word_column_filters.append(col.ilike(f"%{word}%"))
-            search_filters.append(or_(*word_column_filters))
-        return and_(*search_filters)
-
-    # Apply filters to the query
-    filt = await build_filters(search)
-    temp_filters = filters.copy()
-    if filt is not None:
-        temp_filters.append(filt)
-        stmt = select(model).where(*temp_filters).limit(1)
-        result = await db.execute(stmt)
-        if result.scalars().first():
-            filters.append(filt)
-        else:
-            # Handle transliteration for non-latin text
-            search_translit = None
-            try:
-                if search and LATIN_RE.search(search):
-                    search_translit = translit(search, "bg")
-                elif search and CYRILLIC_RE.search(search):
-                    search_translit = translit(search, reversed=True)
-            except Exception:
-                pass
-
-            if search_translit and search_translit != search:
-                filt_translit = await build_filters(search_translit)
-                if filt_translit is not None:
-                    filters.append(filt_translit)
 
+def _order_by(model, ordering: str, rank=None) -> list:
     # Ordering logic
+    if ordering == "rank":
+        if rank is not None:
+            return [desc(rank), desc(model.created_at)]
+        ordering = "-created_at"
     if ordering.startswith("-"):
         order_column = getattr(model, ordering[1:], getattr(model, "created_at"))
         order_by = [desc(order_column)]
@@ -81,4 +194,4 @@ async def apply_filters_search_ordering(
         order_column = getattr(model, ordering, getattr(model, "created_at"))
         order_by = [asc(order_column)]
 
-    return filters, order_by
+    return order_by
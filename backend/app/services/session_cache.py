@@ -0,0 +1,214 @@
+import asyncio
+import time
+from collections import OrderedDict
+from app.core.settings import settings
+from app.core.redis_client import get_redis_client, redis_manager
+
+
+REVOCATIONS_KEY = "session_revocations"
+
+
+class SessionCache:
+    """
+    Per-worker LRU/TTL cache of decoded session dicts.
+
+    Entries are dropped when any worker publishes the session key on the
+    invalidation channel, so hot sessions are served without a Redis round trip.
+    The TTL bounds staleness if an invalidation message is ever missed.
+
+    With revocation_ttl set (signed session tokens), invalidated keys are also
+    remembered for that long, locally and in a Redis sorted set that workers
+    load on (re)subscribe, so tokens issued before a change are not trusted.
+
+    With pin_writes (Redis read replicas), every invalidated key is also kept
+    on the primary for a moment on every worker, so reads see the write.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_size: int,
+        ttl: float,
+        channel: str,
+        revocation_ttl: float | None = None,
+        pin_writes: bool = False,
+    ):
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self.channel = channel
+        self.revocation_ttl = revocation_ttl
+        self.pin_writes = pin_writes
+        # key -> wall clock deadline
+        self._revoked: dict[str, float] = {}
+        # key -> (entry deadline, session dict, Redis key deadline if known)
+        self._entries: OrderedDict[str, tuple[float, dict, float | None]] = OrderedDict()
+        # Bumped on every invalidation; a read that started before an
+        # invalidation must not repopulate the cache with what it fetched.
+        self.generation = 0
+        self._listener: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key: str, min_key_ttl: float | None = None) -> dict | None:
+        """
+        Return a copy of the cached session. With min_key_ttl, entries whose
+        Redis key is known to expire sooner than that are treated as misses so
+        the caller goes to Redis (e.g. to slide the expiry).
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, data, key_expires_at = entry
+        now = time.monotonic()
+        if expires_at < now:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        if min_key_ttl is not None and (
+            key_expires_at is None or key_expires_at - now < min_key_ttl
+        ):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Callers add request-specific fields, never hand out the cached dict
+        return dict(data)
+
+    def set(
+        self, key: str, data: dict, generation: int, key_ttl: float | None = None
+    ):
+        if not self.enabled or generation != self.generation:
+            return
+        now = time.monotonic()
+        key_expires_at = now + key_ttl if key_ttl is not None else None
+        self._entries[key] = (now + self.ttl, dict(data), key_expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def publishing(self) -> bool:
+        return self.enabled or self.revocation_ttl is not None or self.pin_writes
+
+    def invalidate(self, key: str):
+        if self.pin_writes:
+            redis_manager.mark_written(key)
+        self.generation += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        if self.revocation_ttl is not None:
+            self._revoked[key] = time.time() + self.revocation_ttl
+
+    def is_revoked(self, key: str) -> bool:
+        deadline = self._revoked.get(key)
+        if deadline is None:
+            return False
+        if deadline < time.time():
+            del self._revoked[key]
+            return False
+        return True
+
+    def _prune_revoked(self):
+        now = time.time()
+        for key in [key for key, deadline in self._revoked.items() if deadline < now]:
+            del self._revoked[key]
+
+    async def _load_revoked(self, redis):
+        now = time.time()
+        entries = await redis.zrangebyscore(REVOCATIONS_KEY, now, "+inf", withscores=True)
+        self._revoked.update(entries)
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def queue_invalidation(self, pipe, key: str):
+        """Invalidate locally and add the PUBLISH to a caller's pipeline"""
+        self.invalidate(key)
+        if self.revocation_ttl is not None:
+            now = time.time()
+            pipe.zadd(REVOCATIONS_KEY, {key: now + self.revocation_ttl})
+            pipe.zremrangebyscore(REVOCATIONS_KEY, "-inf", now)
+        if self.publishing:
+            pipe.publish(self.channel, key)
+
+    async def _listen(self):
+        while True:
+            try:
+                subscriber = redis_manager.pubsub_client()
+                pubsub = subscriber.pubsub(ignore_subscribe_messages=True)
+                try:
+                    await pubsub.subscribe(self.channel)
+                    # Anything cached before (re)subscribing may have missed
+                    # messages. The connection is never silently reconnected,
+                    # so every new subscription comes through here.
+                    self.clear()
+                    if self.revocation_ttl is not None:
+                        await self._load_revoked(await get_redis_client())
+                    while True:
+                        # Waking up at the health check interval lets the
+                        # PING run on an idle channel
+                        message = await pubsub.get_message(
+                            timeout=settings.REDIS_HEALTH_CHECK_INTERVAL or None
+                        )
+                        if message is not None and message["type"] == "message":
+                            self.invalidate(message["data"])
+                            if len(self._revoked) > self.max_size:
+                                self._prune_revoked()
+                finally:
+                    await pubsub.close()
+                    await subscriber.close(close_connection_pool=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Session cache listener error, resubscribing: {e}")
+                self.clear()
+                await asyncio.sleep(1)
+
+    def start(self):
+        if self.publishing and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "revoked": len(self._revoked),
+        }
+
+
+session_cache = SessionCache(
+    enabled=settings.SESSION_LOCAL_CACHE_ENABLED,
+    max_size=settings.SESSION_LOCAL_CACHE_SIZE,
+    ttl=settings.SESSION_LOCAL_CACHE_TTL,
+    channel=settings.SESSION_INVALIDATION_CHANNEL,
+    revocation_ttl=(
+        settings.SESSION_TOKEN_MAX_AGE if settings.SESSION_BACKEND == "signed" else None
+    ),
+    # Replicas only serve sessions kept on REDIS_URL
+    pin_writes=bool(settings.REDIS_REPLICA_URLS) and settings.SESSION_STORE_MODE == "single",
+)
@@ -0,0 +1,87 @@
+import json
+import time
+from datetime import datetime
+import msgpack
+from app.core.settings import settings
+
+# First byte of every msgpack payload. JSON payloads always start with "{",
+# so sessions written before the rollout still decode.
+MSGPACK_V1 = 0x01
+
+# Long field name -> short key stored in Redis
+MSGPACK_V1_FIELDS = {
+    "user_id": "u",
+    "email": "e",
+    "first_name": "f",
+    "last_name": "l",
+    "role": "r",
+    "profile_picture": "p",
+    "user_agent": "a",
+}
+# ISO-8601 timestamps stored as integer epoch seconds
+MSGPACK_V1_TIMESTAMPS = {
+    "created_at": "c",
+    "updated_at": "m",
+}
+_MSGPACK_V1_NAMES = {
+    short: name
+    for name, short in {**MSGPACK_V1_FIELDS, **MSGPACK_V1_TIMESTAMPS}.items()
+}
+
+
+def _to_epoch(value: str) -> int:
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def _from_epoch(value: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(value))
+
+
+class JsonSessionSerializer:
+    name = "json"
+
+    def dumps(self, data: dict) -> bytes:
+        return json.dumps(data).encode()
+
+
+class MsgpackSessionSerializer:
+    """Versioned msgpack encoding with short keys and epoch timestamps"""
+
+    name = "msgpack"
+
+    def dumps(self, data: dict) -> bytes:
+        compact = {}
+        for name, value in data.items():
+            if name in MSGPACK_V1_TIMESTAMPS and value:
+                compact[MSGPACK_V1_TIMESTAMPS[name]] = _to_epoch(value)
+            else:
+                # Unknown fields keep their full name
+                compact[MSGPACK_V1_FIELDS.get(name, name)] = value
+        return bytes([MSGPACK_V1]) + msgpack.packb(compact)
+
+
+def loads_session(raw: bytes) -> dict:
+    """Decode a session payload written by any serializer version"""
+    if raw[0] != MSGPACK_V1:
+        return json.loads(raw)
+
+    data = {
+        _MSGPACK_V1_NAMES.get(short, short): value
+        for short, value in msgpack.unpackb(raw[1:]).items()
+    }
+    for name in MSGPACK_V1_TIMESTAMPS:
+        if data.get(name) is not None:
+            data[name] = _from_epoch(data[name])
+    return data
+
+
+SESSION_SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (JsonSessionSerializer(), MsgpackSessionSerializer())
+}
+
+session_serializer = SESSION_SERIALIZERS[settings.SESSION_SERIALIZER]
+
+
+def dumps_session(data: dict) -> bytes:
+    return session_serializer.dumps(data)
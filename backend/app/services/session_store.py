@@ -0,0 +1,215 @@
+import asyncio
+import bisect
+import hashlib
+from contextlib import asynccontextmanager
+import redis.asyncio as aioredis
+from redis.cluster import key_slot
+from app.core.settings import settings
+from app.core.redis_client import (
+    _cluster_kwargs,
+    _pool_kwargs,
+    _pool_metrics,
+    get_redis_binary_client,
+    get_redis_client,
+    redis_manager,
+)
+from app.services.session_cache import session_cache
+
+SESSION_STORE_MODES = ("single", "cluster", "sharded")
+
+
+def hash_tag(key: str) -> str:
+    """The part of a key Redis Cluster hashes: the first non-empty {...}"""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes, so adding a node moves ~1/N keys"""
+
+    def __init__(self, nodes: list[str], replicas: int):
+        points = sorted(
+            (self._hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def get_node(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class SessionPipeline:
+    """
+    Pipeline on the node owning a routing key. Cache invalidations and deletes
+    of keys owned by another node are collected and sent after execute().
+    """
+
+    def __init__(self, store: "SessionStore", pipe, routing_key: str):
+        self._store = store
+        self._pipe = pipe
+        self._routing_key = routing_key
+        self._invalidations: list[str] = []
+        self._deferred_deletes: list[str] = []
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    def delete_key(self, key: str):
+        if self._store.same_node(key, self._routing_key):
+            self._pipe.delete(key)
+        else:
+            self._deferred_deletes.append(key)
+
+    def invalidate(self, key: str):
+        if self._store.mode == "single":
+            session_cache.queue_invalidation(self._pipe, key)
+        else:
+            # The invalidation channel lives on REDIS_URL, not on this node
+            self._invalidations.append(key)
+
+    async def execute(self):
+        results = await self._pipe.execute()
+        for key in self._deferred_deletes:
+            await (await self._store.client(key)).delete(key)
+        if self._invalidations:
+            await self._store.publish_invalidations(self._invalidations)
+        return results
+
+
+class SessionStore:
+    """
+    Routes session keys to Redis. Keys of one user carry the same {hash tag},
+    so in cluster mode they share a slot and in sharded mode a node, and
+    per-user pipelines and MGETs never cross nodes.
+    """
+
+    def __init__(self, mode: str, nodes: list[str], replicas: int):
+        if mode not in SESSION_STORE_MODES:
+            raise ValueError(f"Unknown SESSION_STORE_MODE: {mode}")
+        if mode != "single" and not nodes:
+            raise ValueError(f"SESSION_STORE_MODE={mode} requires SESSION_REDIS_NODES")
+        self.mode = mode
+        self.nodes = nodes
+        self._ring = HashRing(nodes, replicas) if mode == "sharded" else None
+        self._lock = asyncio.Lock()
+        self._clients: dict[str, aioredis.Redis] = {}
+        self._cluster: aioredis.RedisCluster | None = None
+
+    @property
+    def tagged(self) -> bool:
+        """Whether session ids carry the owner's hash tag"""
+        return self.mode != "single"
+
+    @property
+    def started(self) -> bool:
+        return self._cluster is not None or bool(self._clients)
+
+    async def startup(self):
+        if self.mode == "single":
+            return
+        async with self._lock:
+            if self.started:
+                return
+            if self.mode == "cluster":
+                self._cluster = aioredis.RedisCluster.from_url(
+                    self.nodes[0], **_cluster_kwargs()
+                )
+                await self._cluster.initialize()
+            else:
+                self._clients = {
+                    url: aioredis.Redis(
+                        connection_pool=aioredis.BlockingConnectionPool.from_url(
+                            url, **_pool_kwargs()
+                        )
+                    )
+                    for url in self.nodes
+                }
+
+    async def shutdown(self):
+        async with self._lock:
+            if self._cluster is not None:
+                await self._cluster.close()
+                self._cluster = None
+            for client in self._clients.values():
+                await client.close(close_connection_pool=True)
+            self._clients = {}
+
+    def node_for(self, key: str) -> str | None:
+        if self.mode == "sharded":
+            return self._ring.get_node(hash_tag(key))
+        if self.mode == "cluster":
+            return str(key_slot(key.encode()))
+        return None
+
+    def same_node(self, key: str, other_key: str) -> bool:
+        return self.node_for(key) == self.node_for(other_key)
+
+    async def client(self, key: str):
+        """Bytes-returning client that owns key"""
+        if self.mode == "single":
+            return await get_redis_binary_client()
+        if not self.started:
+            await self.startup()
+        if self.mode == "cluster":
+            return self._cluster
+        return self._clients[self.node_for(key)]
+
+    async def get(self, key: str, primary_on_miss: bool = True) -> bytes | None:
+        """
+        GET key, from a REDIS_URL replica when configured. A miss on a replica
+        is retried on the primary with primary_on_miss, since a session
+        created moments ago by another worker may not have replicated yet.
+        """
+        if self.mode != "single":
+            return await (await self.client(key)).get(key)
+        redis = await redis_manager.get_read_client(key, binary=True)
+        value = await redis.get(key)
+        if value is None and primary_on_miss and redis is not redis_manager.binary_client:
+            value = await (await get_redis_binary_client()).get(key)
+        return value
+
+    @asynccontextmanager
+    async def pipeline(self, routing_key: str, transaction: bool = True):
+        """
+        Pipeline for keys sharing routing_key's hash tag. Redis Cluster
+        pipelines cannot run MULTI/EXEC, so there they are never transactional.
+        """
+        client = await self.client(routing_key)
+        if self.mode == "cluster":
+            transaction = False
+        async with client.pipeline(transaction=transaction) as pipe:
+            yield SessionPipeline(self, pipe, routing_key)
+
+    async def publish_invalidations(self, keys: list[str]):
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                session_cache.queue_invalidation(pipe, key)
+            await pipe.execute()
+
+    def metrics(self) -> dict:
+        metrics = {"mode": self.mode}
+        if self._clients:
+            metrics["nodes"] = {
+                url: _pool_metrics(client.connection_pool)
+                for url, client in self._clients.items()
+            }
+        if self._cluster is not None:
+            metrics["cluster_nodes"] = len(self._cluster.get_nodes())
+        return metrics
+
+
+session_store = SessionStore(
+    mode=settings.SESSION_STORE_MODE,
+    nodes=settings.SESSION_REDIS_NODES,
+    replicas=settings.SESSION_HASH_RING_REPLICAS,
+)
@@ -0,0 +1,35 @@
+import time
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from app.core.settings import settings
+from app.services.session_serializer import MSGPACK_V1_FIELDS
+
+# Claims carried by a signed session token, stored under the same short keys
+# as the msgpack session format to keep the cookie small.
+TOKEN_CLAIMS = ["user_id", "email", "first_name", "last_name", "role", "profile_picture"]
+_CLAIM_NAMES = {MSGPACK_V1_FIELDS[name]: name for name in TOKEN_CLAIMS}
+
+token_serializer = URLSafeTimedSerializer(settings.SECRET_KEY, salt="session-token")
+
+
+def is_session_token(value: str) -> bool:
+    # Opaque session ids come from secrets.token_urlsafe and never contain "."
+    return "." in value
+
+
+def issue_session_token(session_id: str, session_data: dict) -> str:
+    payload = {MSGPACK_V1_FIELDS[name]: session_data.get(name) for name in TOKEN_CLAIMS}
+    payload["s"] = session_id
+    return token_serializer.dumps(payload)
+
+
+def read_session_token(token: str) -> tuple[str, dict, float] | None:
+    """Return (session id, claims, age in seconds), or None for a bad signature"""
+    try:
+        payload, issued_at = token_serializer.loads(token, return_timestamp=True)
+    except BadSignature:
+        return None
+    session_id = payload.pop("s", None)
+    if not session_id:
+        return None
+    claims = {_CLAIM_NAMES.get(short, short): value for short, value in payload.items()}
+    return session_id, claims, time.time() - issued_at.timestamp()
@@ -0,0 +1,73 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis_client import redis_manager
+from app.db.models.blog import BlogPost
+from app.services.search import search_forms
+
+# Sorted set with every member at score 0, so ZRANGEBYLEX walks it in byte
+# order. Members are "<indexed text>\0<slug>\0<title>": each word-start
+# suffix of the title and of its transliterations, so a prefix of any word
+# in the title finds the post.
+SUGGEST_KEY = b"blog_suggest"
+# Sorts before every prefix; keeps the key present when there are no posts
+EMPTY_MARKER = b"\x00"
+SEPARATOR = b"\x00"
+# Candidates read per requested suggestion, covering one post matching
+# through several of its suffixes
+FANOUT = 4
+
+
+def _members(slug: str, title: str) -> set[bytes]:
+    tail = SEPARATOR + slug.encode() + SEPARATOR + title.encode()
+    members = set()
+    for form in search_forms(title):
+        words = form.split()
+        for i in range(len(words)):
+            members.add(" ".join(words[i:]).encode() + tail)
+    return members
+
+
+async def rebuild_suggest_index(db: AsyncSession):
+    """Rebuild the whole index from blog_posts and swap it in atomically"""
+    result = await db.execute(select(BlogPost.slug, BlogPost.title))
+    members = {EMPTY_MARKER}
+    for slug, title in result.all():
+        members |= _members(slug, title)
+
+    building_key = SUGGEST_KEY + b":building"
+    redis = await redis_manager.get_binary_client()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(building_key)
+        pipe.zadd(building_key, {member: 0 for member in members})
+        pipe.rename(building_key, SUGGEST_KEY)
+        await pipe.execute()
+    redis_manager.mark_written(SUGGEST_KEY.decode())
+
+
+async def suggest(db: AsyncSession, prefix: str, limit: int) -> list[dict]:
+    """
+    Up to limit posts with a title word starting with prefix, in either
+    script; one ZRANGEBYLEX, plus a rebuild if the index is missing.
+    """
+    prefix = " ".join(prefix.lower().split()).encode()
+    if not prefix:
+        return []
+    redis_read = await redis_manager.get_read_client(SUGGEST_KEY.decode(), binary=True)
+    # \xff never occurs in UTF-8, so it bounds every member starting with prefix
+    found = await redis_read.zrangebylex(
+        SUGGEST_KEY, b"[" + prefix, b"[" + prefix + b"\xff", start=0, num=limit * FANOUT
+    )
+    if not found and not await redis_read.exists(SUGGEST_KEY):
+        await rebuild_suggest_index(db)
+        return await suggest(db, prefix.decode(), limit)
+
+    suggestions = {}
+    for member in found:
+        _, slug, title = member.split(SEPARATOR, 2)
+        slug = slug.decode()
+        if slug not in suggestions:
+            suggestions[slug] = {"slug": slug, "title": title.decode()}
+            if len(suggestions) == limit:
+                break
+    return list(suggestions.values())
@@ -0,0 +1,126 @@
+"""
+Compare OFFSET and keyset (cursor) page fetches at increasing page depth.
+
+    DATABASE_URL_WRITER=postgresql+asyncpg://... python -m scripts.bench_keyset_pagination --rows 1000000
+
+Rows go into a temporary table, so nothing is left behind. The total count
+query is the same in both modes and is left out of the timings.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import Column, DateTime, Integer, String, desc, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from app.core.settings import settings
+from app.services.pagination import _keyset_columns, _paginate_keyset, encode_cursor
+
+BenchBase = declarative_base()
+
+
+class BenchPost(BenchBase):
+    __tablename__ = "bench_keyset_posts"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(200), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+ORDERING = [desc(BenchPost.created_at)]
+
+
+async def timed(coro_factory, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await coro_factory()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.DATABASE_URL_WRITER)
+    async with engine.connect() as conn:
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE bench_keyset_posts ("
+                " id integer PRIMARY KEY, title varchar(200) NOT NULL,"
+                " created_at timestamptz NOT NULL)"
+            )
+        )
+        # Several posts per second, so created_at has ties for the id tiebreaker
+        await conn.execute(
+            text(
+                "INSERT INTO bench_keyset_posts "
+                "SELECT i, 'Post ' || i, now() - (i / 4) * interval '1 second' "
+                "FROM generate_series(1, :rows) AS i"
+            ),
+            {"rows": args.rows},
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX ix_bench_keyset_posts_created_at_id "
+                "ON bench_keyset_posts (created_at, id)"
+            )
+        )
+        await conn.execute(text("ANALYZE bench_keyset_posts"))
+
+        db = AsyncSession(bind=conn)
+        columns = _keyset_columns(BenchPost, ORDERING)
+        last_page = args.rows // args.page_size
+        depths = [page for page in (1, 10, 100, 1_000, 10_000, 100_000) if page < last_page]
+        depths.append(last_page)
+
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10}")
+        for page in depths:
+            offset = (page - 1) * args.page_size
+            offset_query = (
+                select(BenchPost)
+                .order_by(*ORDERING, desc(BenchPost.id))
+                .offset(offset)
+                .limit(args.page_size)
+            )
+
+            async def fetch_offset():
+                (await db.execute(offset_query)).scalars().all()
+
+            # The cursor a client would hold after reading the previous page
+            cursor = None
+            if offset:
+                previous = (
+                    await db.execute(
+                        select(BenchPost)
+                        .order_by(*ORDERING, desc(BenchPost.id))
+                        .offset(offset - 1)
+                        .limit(1)
+                    )
+                ).scalar_one()
+                cursor = encode_cursor(columns, previous)
+
+            async def fetch_keyset():
+                await _paginate_keyset(
+                    BenchPost,
+                    db,
+                    select(BenchPost),
+                    args.page_size,
+                    ORDERING,
+                    cursor,
+                    None,
+                )
+
+            offset_ms = await timed(fetch_offset, args.iterations)
+            keyset_ms = await timed(fetch_keyset, args.iterations)
+            print(f"{page:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+            db.expunge_all()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Count Redis round trips and latency of the login session flow.
+
+    REDIS_URL=redis://localhost:6379 python -m scripts.bench_login_roundtrips
+
+Compares the previous command-per-await sequence (DEL anonymous, SET, EXPIRE)
+with create_session(), which writes everything in one MULTI/EXEC.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+from types import SimpleNamespace
+
+from redis.asyncio.connection import Connection
+
+from app.core.redis_client import get_redis_client
+from app.core.settings import settings
+from app.services.auth import create_session, revoke_user_sessions
+
+round_trips = 0
+_send_packed_command = Connection.send_packed_command
+
+
+async def _counting_send_packed_command(self, *args, **kwargs):
+    global round_trips
+    round_trips += 1
+    return await _send_packed_command(self, *args, **kwargs)
+
+
+Connection.send_packed_command = _counting_send_packed_command
+
+USER = SimpleNamespace(
+    id="bench-user",
+    email="bench@example.com",
+    first_name="Bench",
+    last_name="User",
+    role="customer",
+    profile_picture=None,
+)
+legacy_keys: list[str] = []
+
+
+async def legacy_login(redis, anonymous_session_id: str):
+    await redis.delete(f"anonymous_session:{anonymous_session_id}")
+    session_id = secrets.token_urlsafe(32)
+    key = f"user_session:{session_id}"
+    legacy_keys.append(key)
+    await redis.set(key, json.dumps({"user_id": USER.id, "email": USER.email}))
+    await redis.expire(key, settings.SESSION_EXPIRE_SECONDS)
+
+
+async def pipelined_login(redis, anonymous_session_id: str):
+    await create_session(
+        USER, "bench", replace_anonymous_session_id=anonymous_session_id
+    )
+
+
+async def run(name: str, flow, iterations: int):
+    global round_trips
+    redis = await get_redis_client()
+    await redis.ping()
+
+    round_trips = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await flow(redis, secrets.token_urlsafe(32))
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<10} {round_trips / iterations:>12.1f} "
+        f"{elapsed / iterations * 1000:>12.3f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'flow':<10} {'round trips':>12} {'ms / login':>12}")
+    await run("legacy", legacy_login, args.iterations)
+    await run("pipelined", pipelined_login, args.iterations)
+
+    redis = await get_redis_client()
+    await redis.delete(*legacy_keys)
+    await revoke_user_sessions(USER.id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
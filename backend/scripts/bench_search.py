@@ -0,0 +1,85 @@
+"""
+Compare the trigram and fulltext blog search engines on the blog_posts table.
+
+    DATABASE_URL_WRITER=postgresql+asyncpg://... python -m scripts.bench_search --rows 100000
+
+Needs the search_vector migration. --rows synthetic posts are inserted in a
+transaction that is rolled back at the end, so the table is left unchanged.
+Each query is timed as the blog list endpoint runs it: search filters, then
+the first page.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.blog import BlogPost
+from app.db.session import engine_writer
+from app.services.search import apply_filters_search_ordering
+
+WORDS = (
+    "python fastapi postgres redis celery docker search index cache session "
+    "програмиране сървър база данни търсене индекс кеш сесия заявка"
+).split()
+QUERIES = ["postgres", "търсене индекс", "redis cache", "tarsene", "fastapi docker"]
+
+
+async def run(db: AsyncSession, engine: str, search: str, iterations: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        filters, order_by = await apply_filters_search_ordering(
+            model=BlogPost,
+            db=db,
+            search=search,
+            search_columns=[BlogPost.search_text],
+            ordering="rank",
+            engine=engine,
+        )
+        result = await db.execute(select(BlogPost).where(*filters).order_by(*order_by).limit(10))
+        found = len(result.scalars().all())
+    return (time.perf_counter() - started) / iterations * 1000, found
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--query", action="append", help="search text, repeatable")
+    args = parser.parse_args()
+
+    async with engine_writer.connect() as conn:
+        transaction = await conn.begin()
+        if args.rows:
+            # Titles and bodies from a small vocabulary, so words repeat
+            await conn.execute(
+                text(
+                    "INSERT INTO blog_posts (title, search_text, slug, paragraphs) "
+                    "SELECT t, t, 'bench-search-' || i, "
+                    "ARRAY[array_to_string(ARRAY(SELECT w[1 + (i * k) % n] "
+                    "FROM generate_series(1, 40) AS k), ' ')] "
+                    "FROM generate_series(1, :rows) AS i, "
+                    "(SELECT CAST(:words AS text[]) AS w, :count AS n) AS vocabulary, "
+                    "LATERAL (SELECT w[1 + i % n] || ' ' || w[1 + (i / n) % n] AS t) AS title"
+                ),
+                {"rows": args.rows, "words": list(WORDS), "count": len(WORDS)},
+            )
+            await conn.execute(text("ANALYZE blog_posts"))
+
+        db = AsyncSession(bind=conn)
+        print(f"{'query':<20} {'trigram ms':>11} {'hits':>5} {'fulltext ms':>12} {'hits':>5}")
+        for search in args.query or QUERIES:
+            trigram_ms, trigram_found = await run(db, "trigram", search, args.iterations)
+            fulltext_ms, fulltext_found = await run(db, "fulltext", search, args.iterations)
+            print(
+                f"{search:<20} {trigram_ms:>11.2f} {trigram_found:>5} "
+                f"{fulltext_ms:>12.2f} {fulltext_found:>5}"
+            )
+        await transaction.rollback()
+
+    await engine_writer.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
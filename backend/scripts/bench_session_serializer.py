@@ -0,0 +1,48 @@
+"""
+Compare session payload size and decode time for each session serializer.
+
+    python -m scripts.bench_session_serializer --sessions 100000
+"""
+import argparse
+import timeit
+
+from app.services.session_serializer import SESSION_SERIALIZERS, loads_session
+
+SAMPLE_SESSION = {
+    "user_id": "48213",
+    "email": "ivana.petrova@example.com",
+    "first_name": "Ivana",
+    "last_name": "Petrova",
+    "role": "customer",
+    "profile_picture": "https://cdn.example.com/profile_pictures/3f9a1c7e2b.webp",
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "created_at": "2026-10-18T09:41:27.512345Z",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(
+        f"{'serializer':<10} {'bytes':>6} {'decode us':>10} "
+        f"{f'MiB / {args.sessions} sessions':>24}"
+    )
+    for name, serializer in SESSION_SERIALIZERS.items():
+        payload = serializer.dumps(SAMPLE_SESSION)
+        seconds = timeit.timeit(lambda: loads_session(payload), number=args.iterations)
+        print(
+            f"{name:<10} {len(payload):>6} "
+            f"{seconds / args.iterations * 1_000_000:>10.2f} "
+            f"{len(payload) * args.sessions / 1024 / 1024:>24.1f}"
+        )
+    print("\nValue bytes only; Redis adds per-key overhead on top of both formats.")
+
+
+if __name__ == "__main__":
+    main()
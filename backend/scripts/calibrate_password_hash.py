@@ -0,0 +1,72 @@
+"""
+Measure Argon2id hash latency on this host and suggest cost parameters.
+
+    python -m scripts.calibrate_password_hash --target-ms 250
+
+Run it on the same instance type the backend pods use and copy the printed
+ARGON2_* values into the environment.
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import argon2
+
+MEMORY_COSTS_KIB = [19456, 32768, 47104, 65536, 98304, 131072, 262144]
+TIME_COSTS = [1, 2, 3, 4, 6, 8]
+
+
+def measure(memory_cost: int, time_cost: int, parallelism: int, samples: int) -> float:
+    hasher = argon2.using(
+        type="ID",
+        memory_cost=memory_cost,
+        time_cost=time_cost,
+        parallelism=parallelism,
+    )
+    hasher.hash("warmup-password")
+
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--parallelism", type=int, default=1)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'memory (KiB)':>13} {'time':>5} {'median ms':>10}")
+    best = None
+    for memory_cost in MEMORY_COSTS_KIB:
+        for time_cost in TIME_COSTS:
+            latency = measure(memory_cost, time_cost, args.parallelism, args.samples)
+            print(f"{memory_cost:>13} {time_cost:>5} {latency:>10.1f}")
+            if latency > args.target_ms:
+                # Higher time costs at this memory size will only be slower
+                break
+            # Prefer the most total work (memory * passes) that fits the budget
+            if best is None or memory_cost * time_cost > best[0] * best[1]:
+                best = (memory_cost, time_cost, latency)
+
+    if best is None:
+        print(f"\nNo configuration fits {args.target_ms} ms; use the minimum costs.")
+        return
+
+    memory_cost, time_cost, latency = best
+    print(f"\nBest fit for {args.target_ms} ms per hash ({latency:.1f} ms measured):")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    print(
+        "\nEach concurrent hash holds ~"
+        f"{memory_cost // 1024} MiB; size PASSWORD_HASH_WORKERS against pod memory."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import { Spinner } from '@/ui-components/Spinner/Spinner';
 import styles from './BlogPosts.module.css';
 import type { components } from '@/shared/types';
 
-type BlogPostRead = components['schemas']['BlogPostOut'];
+type BlogPostRead = components['schemas']['BlogPostSummary'];
 
 interface Props {
   posts: BlogPostRead[];
@@ -176,7 +176,7 @@ export default function BlogPostsClient({
                           .replace(/\//g, '.')
                       : ''}
                   </p>
-                  <p className={styles.excerpt}>{post.paragraphs[0].slice(0, 120)}...</p>
+                  <p className={styles.excerpt}>{post.excerpt.slice(0, 120)}...</p>
                   <div className={styles.cardActions}>
                     <Button
                       variant="primary"
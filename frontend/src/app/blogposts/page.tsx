@@ -60,7 +60,7 @@ export default async function BlogPostsPage({ searchParams }: Props) {
       dateModified: post.updated_at,
       url: `${process.env.NEXT_PUBLIC_CLIENT_URL}/blogposts/${post.slug}`,
       image: post.image || undefined,
-      description: post.paragraphs[0]?.slice(0, 120),
+      description: post.excerpt.slice(0, 120),
     }))
   };
 
@@ -101,7 +101,7 @@ export default async function BlogPostsPage({ searchParams }: Props) {
       {/* Client component receives posts, pagination info, and authors */}
       <BlogPostsClient
         posts={data.items}
-        currentPage={data.current_page}
+        currentPage={data.current_page ?? 1}
         totalPages={data.total_pages}
         searchQuery={search || ""}
         authors={data.authors}
@@ -467,18 +467,54 @@ export interface components {
             /** Slug */
             slug: string;
         };
+        /**
+         * BlogPostSummary
+         * @description List item: the post without its paragraphs
+         */
+        BlogPostSummary: {
+            /** Id */
+            id: number;
+            /** Slug */
+            slug: string;
+            /** Title */
+            title: string;
+            /** Image */
+            image?: string | null;
+            /** Excerpt */
+            excerpt: string;
+            /** Authored By */
+            authored_by?: string | null;
+            /**
+             * Created At
+             * Format: date-time
+             */
+            created_at: string;
+            /** Updated At */
+            updated_at?: string | null;
+            /** Snippet */
+            snippet?: string | null;
+        };
         /** BlogPostsWithAuthors */
         BlogPostsWithAuthors: {
             /** Total Count */
             total_count: number;
+            /**
+             * Total Count Exact
+             * @default true
+             */
+            total_count_exact: boolean;
             /** Current Page */
-            current_page: number;
+            current_page: number | null;
             /** Page Size */
             page_size: number;
             /** Total Pages */
             total_pages: number;
             /** Items */
-            items: components["schemas"]["BlogPostOut"][];
+            items: components["schemas"]["BlogPostSummary"][];
+            /** Next Cursor */
+            next_cursor?: string | null;
+            /** Prev Cursor */
+            prev_cursor?: string | null;
             /**
              * Authors
              * @default []